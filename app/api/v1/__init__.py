@@ -1,8 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1 import usuario, empresa, entity_config
+from app.api.v1 import usuario, empresa, entity_config, catalog, auth, admin
 
 router = APIRouter()
 
 router.include_router(usuario.router, prefix="/usuarios", tags=["Usuarios"])
 router.include_router(empresa.router, prefix="/empresas", tags=["Empresas"])
 router.include_router(entity_config.router, prefix="/entity-config", tags=["Entity Config"])
+router.include_router(catalog.router, prefix="/catalogos", tags=["Catálogos"])
+router.include_router(auth.router, prefix="/auth", tags=["Auth"])
+router.include_router(admin.router, prefix="/admin", tags=["Admin"])
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.admin import require_admin
+from app.core import profiling
+from app.core.admission import admission
+from app.core.response_cache import response_cache
+from app.utils.safe_regex import regex_metrics
+from typing import List, Dict, Any
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/profiles", response_model=List[Dict[str, Any]])
+async def list_profiles():
+    return profiling.list_profiles()
+
+@router.get("/profiles/{profile_id}", response_model=Dict[str, Any])
+async def get_profile(profile_id: str):
+    profile = profiling.get_profile(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return profile
+
+@router.get("/regex-metrics", response_model=Dict[str, Dict[str, Any]])
+async def get_regex_metrics():
+    """Tiempo de evaluación de regex por campo de custom_data en este worker."""
+    return regex_metrics.snapshot()
+
+@router.get("/admission", response_model=Dict[str, Any])
+async def get_admission_metrics():
+    """Peticiones en curso, profundidad de cola y rechazos del control de admisión de este worker."""
+    return admission.snapshot()
+
+@router.get("/response-cache", response_model=Dict[str, Any])
+async def get_response_cache_metrics():
+    """Tamaño y aciertos de la caché de listados de este worker."""
+    return response_cache.snapshot()
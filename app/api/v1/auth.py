@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db import get_db
+from app.core.deadlines import DeadlineRoute
+from app.services.auth import AuthService
+from app.schemas.auth import LoginRequest
+from app.schemas.usuario import Usuario
+
+router = APIRouter(route_class=DeadlineRoute)
+
+@router.post("/login", response_model=Usuario)
+async def login(
+    credentials: LoginRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_db)
+):
+    """Verifica email y contraseña; responde 401 sin indicar cuál de los dos falló."""
+    service = AuthService(session)
+    client_ip = request.client.host if request.client else "desconocida"
+    return await service.login(credentials.email, credentials.password, client_ip)
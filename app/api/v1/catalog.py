@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db import get_db
+from app.core.deadlines import DeadlineRoute, db_deadline
+from app.core.settings import settings
+from app.services.catalog import CatalogService
+from app.schemas.catalog import Catalog, CatalogCreate, CatalogOptionIn, CatalogOptionPage
+from typing import List
+from uuid import UUID
+
+router = APIRouter(route_class=DeadlineRoute)
+
+OPTIONS_MAX_LIMIT = 200
+
+@router.post("/", response_model=Catalog)
+@db_deadline(timeout_ms=30000)
+async def create_catalog(
+    catalog: CatalogCreate,
+    session: AsyncSession = Depends(get_db)
+):
+    if len(catalog.options) > settings.CATALOG_MAX_OPTIONS:
+        raise HTTPException(status_code=400, detail=f"Un catálogo admite como máximo {settings.CATALOG_MAX_OPTIONS} opciones")
+    service = CatalogService(session)
+    return await service.create(catalog)
+
+@router.get("/", response_model=List[Catalog])
+async def list_catalogs(
+    empresa_id: UUID,
+    session: AsyncSession = Depends(get_db)
+):
+    service = CatalogService(session)
+    return await service.list_by_empresa(empresa_id)
+
+@router.put("/{catalog_id}/options", response_model=Catalog)
+@db_deadline(timeout_ms=30000)
+async def replace_catalog_options(
+    catalog_id: int,
+    options: List[CatalogOptionIn] = Body(..., max_length=settings.CATALOG_MAX_OPTIONS),
+    session: AsyncSession = Depends(get_db)
+):
+    """Reemplaza todas las opciones del catálogo y sube su versión."""
+    service = CatalogService(session)
+    catalog = await service.replace_options(catalog_id, options)
+    if not catalog:
+        raise HTTPException(status_code=404, detail="Catálogo no encontrado")
+    return catalog
+
+@router.get("/{catalog_id}/options", response_model=CatalogOptionPage)
+async def list_catalog_options(
+    catalog_id: int,
+    q: str | None = Query(None, description="Texto a buscar en la etiqueta o el valor"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=OPTIONS_MAX_LIMIT),
+    session: AsyncSession = Depends(get_db)
+):
+    service = CatalogService(session)
+    page = await service.get_options_page(catalog_id, q.strip() if q else None, skip, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Catálogo no encontrado")
+    return page
@@ -1,18 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
-from app.services.empresa import EmpresaService
-from app.schemas.empresa import EmpresaCreate, Empresa
+from app.core.deadlines import DeadlineRoute
+from app.services.empresa import EmpresaService, INCLUDE_OPTIONS
+from app.schemas.empresa import EmpresaCreate, Empresa, EmpresaDetail
+from app.utils import fieldsets
 from typing import List
+from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
+
+LIST_MAX_LIMIT = 500
+
+def parse_include(include: str | None = Query(None, description="Datos adicionales: entity_configs,usuarios_count")) -> frozenset:
+    names = frozenset(name.strip() for name in (include or "").split(",") if name.strip())
+    unknown = sorted(names - set(INCLUDE_OPTIONS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Valores de include desconocidos: {', '.join(unknown)}")
+    return names
 
 @router.get("/", response_model=List[Empresa])
 async def list_empresas(
+    fields: str | None = Query(None, description="Campos a devolver, ej: nombre,nit,custom_data.sector"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=LIST_MAX_LIMIT),
     session: AsyncSession = Depends(get_db)
 ):
-    service = EmpresaService(session)
-    return await service.list_all()
+    selection = fieldsets.parse_fields_param(fields, Empresa) if fields else None
+    body = await EmpresaService(session).list_all_json(selection, skip, limit)
+    return Response(content=body, media_type="application/json")
 
 @router.post("/", response_model=Empresa)
 async def create_empresa(
@@ -20,4 +36,28 @@ async def create_empresa(
     session: AsyncSession = Depends(get_db)
 ):
     service = EmpresaService(session)
-    return await service.create(empresa)
\ No newline at end of file
+    return await service.create(empresa)
+
+@router.get("/by-nit/{nit}", response_model=EmpresaDetail)
+async def get_empresa_by_nit(
+    nit: str,
+    include: frozenset = Depends(parse_include),
+    session: AsyncSession = Depends(get_db)
+):
+    service = EmpresaService(session)
+    empresa = await service.get_detail(include, nit=nit)
+    if not empresa:
+        raise HTTPException(status_code=404, detail="Empresa no encontrada")
+    return empresa
+
+@router.get("/{empresa_id}", response_model=EmpresaDetail)
+async def get_empresa(
+    empresa_id: UUID,
+    include: frozenset = Depends(parse_include),
+    session: AsyncSession = Depends(get_db)
+):
+    service = EmpresaService(session)
+    empresa = await service.get_detail(include, empresa_id=str(empresa_id))
+    if not empresa:
+        raise HTTPException(status_code=404, detail="Empresa no encontrada")
+    return empresa
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Header, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
+from app.core.deadlines import DeadlineRoute
 from app.services.entity_config import EntityConfigService
-from app.schemas.entity_config import EntityConfigCreate, EntityConfigUpdate, EntityConfig as EntityConfigSchema
+from app.schemas.entity_config import EntityConfigCreate, EntityConfigUpdate, EntityConfig as EntityConfigSchema, BatchValidationResult
+from app.core.settings import settings
 from app.core.validation_registry import ValidationRegistry
+from app.core.events import entity_config_events
 from uuid import UUID
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
 
 @router.get("/validations", response_model=Dict[str, Dict[str, Any]])
 async def get_validations():
@@ -33,6 +37,21 @@ async def update_entity_config(
         raise HTTPException(status_code=404, detail="Configuración no encontrada")
     return config
 
+@router.get("/events/{empresa_id}", response_class=StreamingResponse)
+async def stream_entity_config_events(
+    empresa_id: UUID,
+    last_event_id: str | None = Header(None)
+):
+    """
+    Server-sent events con los cambios de configuración de la empresa.
+    Ante un evento `resync` el cliente debe volver a pedir la configuración.
+    """
+    return StreamingResponse(
+        entity_config_events.stream(str(empresa_id), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{empresa_id}/{entity_type}", response_model=EntityConfigSchema)
 async def get_entity_config(
     empresa_id: UUID,
@@ -43,4 +62,48 @@ async def get_entity_config(
     config = await service.get_config(empresa_id, entity_type)
     if not config:
         raise HTTPException(status_code=404, detail="Configuración no encontrada")
-    return config
\ No newline at end of file
+    return config
+
+@router.get("/{empresa_id}/{entity_type}/json-schema")
+async def get_entity_json_schema(
+    empresa_id: UUID,
+    entity_type: str,
+    version: str | None = None,
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    JSON Schema de custom_data para prevalidar formularios en el cliente.
+    El ETag es el hash del contenido: pedido con `?version=<hash>` vigente la
+    respuesta es inmutable y se puede cachear indefinidamente; los cambios de
+    configuración se notifican por /events/{empresa_id}.
+    """
+    service = EntityConfigService(session)
+    result = await service.get_json_schema(empresa_id, entity_type)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Configuración no encontrada")
+    schema, schema_version = result
+
+    etag = f'"{schema_version}"'
+    if version == schema_version:
+        cache_control = "public, max-age=31536000, immutable"
+    else:
+        cache_control = "no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control, "X-Schema-Version": schema_version}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse({**schema, "$id": f"urn:entity-config:{empresa_id}:{entity_type}:{schema_version}"}, headers=headers)
+
+@router.post("/{empresa_id}/{entity_type}/validate", response_model=BatchValidationResult)
+async def validate_entity_batch(
+    empresa_id: UUID,
+    entity_type: str,
+    items: List[Dict[str, Any]] = Body(..., max_length=settings.VALIDATE_BATCH_MAX_ITEMS),
+    session: AsyncSession = Depends(get_db)
+):
+    """Valida un lote de custom_data contra la configuración sin guardar nada."""
+    service = EntityConfigService(session)
+    result = await service.validate_batch(empresa_id, entity_type, items)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Configuración no encontrada")
+    return result
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
+from app.core.settings import settings
+from app.core.deadlines import DeadlineRoute, db_deadline
 from app.services.usuario import UsuarioService
-from app.schemas.usuario import UsuarioCreate, Usuario, UsuarioUpdate
+from app.services.usuario_import import UsuarioImportService
+from app.services.usuario_export import UsuarioParquetExporter
+from app.services.empresa import EmpresaService
+from app.services.entity_config import EntityConfigService
+from app.utils.csv_stream import CsvStreamReader, CsvRecordTooLarge
+from app.utils import fieldsets
+from app.schemas.usuario import UsuarioCreate, Usuario, UsuarioUpdate, UsuarioChanges, UsuarioFacets, EmailAvailability, UsuarioBatchGet, UsuarioBatchGetResult
+from pydantic import EmailStr
 from uuid import UUID
 
-router = APIRouter()
+router = APIRouter(route_class=DeadlineRoute)
+
+SEARCH_MAX_LIMIT = 50
 
 @router.post("/", response_model=Usuario)
 async def create_usuario(
@@ -15,6 +27,76 @@ async def create_usuario(
     service = UsuarioService(session)
     return await service.create_with_config(usuario)
 
+@router.post("/batch-get", response_model=UsuarioBatchGetResult)
+async def batch_get_usuarios(
+    data: UsuarioBatchGet,
+    session: AsyncSession = Depends(get_db)
+):
+    """Resuelve varios usuarios por id en una sola consulta, en el orden pedido."""
+    service = UsuarioService(session)
+    return await service.batch_get(data)
+
+@router.post("/import", response_class=StreamingResponse)
+@db_deadline(cancel_on_disconnect=False)
+async def import_usuarios_csv(
+    request: Request,
+    empresa_id: UUID,
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Importa usuarios desde un CSV enviado como cuerpo de la petición (text/csv).
+    Columnas obligatorias: email, nombre, password (texto plano o hash bcrypt);
+    el resto se asigna a custom_data según la configuración de la empresa.
+    La respuesta es un CSV (fila, campo, error) con las filas rechazadas.
+    """
+    if not await EmpresaService(session).get_by_id(str(empresa_id)):
+        raise HTTPException(status_code=404, detail="Empresa no encontrada")
+
+    config = await EntityConfigService(session).get_config(empresa_id, "usuario")
+    importer = UsuarioImportService(empresa_id, config.config if config else None)
+
+    reader = CsvStreamReader(request.stream(), max_record_size=settings.CSV_IMPORT_MAX_RECORD_SIZE)
+    try:
+        header = await reader.read_header()
+    except CsvRecordTooLarge as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    errors = importer.check_header(header)
+    if errors:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Encabezado CSV inválido", "errors": errors}
+        )
+
+    return StreamingResponse(
+        importer.run(reader, header),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="errores_importacion.csv"'}
+    )
+
+@router.get("/export/parquet", response_class=StreamingResponse)
+async def export_usuarios_parquet(
+    empresa_id: UUID,
+    session: AsyncSession = Depends(get_db)
+):
+    """Exporta los usuarios de la empresa a Parquet con una columna tipada por campo de custom_data."""
+    if not await EmpresaService(session).get_by_id(str(empresa_id)):
+        raise HTTPException(status_code=404, detail="Empresa no encontrada")
+
+    config = await EntityConfigService(session).get_config(empresa_id, "usuario")
+    try:
+        exporter = UsuarioParquetExporter(empresa_id, config.config if config else None)
+    except ImportError:
+        raise HTTPException(
+            status_code=501,
+            detail="La exportación Parquet requiere pyarrow (instalar el extra 'analytics')"
+        )
+
+    return StreamingResponse(
+        exporter.stream(),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f'attachment; filename="usuarios_{empresa_id}.parquet"'}
+    )
+
 @router.put("/{usuario_id}", response_model=Usuario)
 async def update_usuario(
     usuario_id: UUID,
@@ -30,20 +112,95 @@ async def update_usuario(
 @router.get("/", response_model=list[Usuario])
 async def list_usuarios(
     empresa_id: UUID | None = None,
+    estado: int | None = None,
     skip: int = 0,
     limit: int = 100,
+    fields: str | None = Query(None, description="Campos a devolver, ej: nombre,email,custom_data.talla_camisa"),
+    session: AsyncSession = Depends(get_db)
+):
+    selection = fieldsets.parse_fields_param(fields, Usuario) if fields else None
+    service = UsuarioService(session)
+    body = await service.get_all_json(selection, skip=skip, limit=limit, empresa_id=str(empresa_id) if empresa_id else None, estado=estado)
+    return Response(content=body, media_type="application/json")
+
+@router.get("/changes", response_model=UsuarioChanges)
+async def list_usuario_changes(
+    empresa_id: UUID,
+    since: str | None = Query(None, description="Cursor devuelto como next_cursor en la llamada anterior"),
+    limit: int = Query(100, ge=1, le=1000),
     session: AsyncSession = Depends(get_db)
 ):
+    """
+    Cambios incrementales (altas, ediciones y bajas lógicas) posteriores al cursor.
+    Se debe guardar `next_cursor` y repetir mientras `has_more` sea verdadero.
+    Los cambios de los últimos CHANGES_SAFETY_LAG_SECONDS aún no se entregan;
+    ese margen debe cubrir la transacción de escritura más larga.
+    """
     service = UsuarioService(session)
-    return await service.get_all(skip=skip, limit=limit, empresa_id=str(empresa_id) if empresa_id else None)
+    try:
+        return await service.get_changes(str(empresa_id), since, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/email-available", response_model=EmailAvailability)
+async def check_email_available(
+    email: EmailStr,
+    session: AsyncSession = Depends(get_db)
+):
+    """
+    Disponibilidad orientativa para formularios: un email registrado en otro
+    worker puede figurar como disponible hasta EMAIL_FILTER_REFRESH_SECONDS.
+    El alta lo rechaza igual con 409.
+    """
+    service = UsuarioService(session)
+    return EmailAvailability(email=email, available=await service.is_email_available(email))
+
+@router.get("/facets", response_model=UsuarioFacets)
+async def get_usuario_facets(
+    empresa_id: UUID,
+    estado: int | None = None,
+    session: AsyncSession = Depends(get_db)
+):
+    """Cantidad de usuarios por valor de cada campo select de la configuración."""
+    service = UsuarioService(session)
+    return await service.get_facets(str(empresa_id), estado=estado)
+
+@router.get("/search", response_model=list[Usuario])
+async def search_usuarios(
+    empresa_id: UUID,
+    q: str = Query(..., min_length=3, max_length=100),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    estado: int | None = None,
+    session: AsyncSession = Depends(get_db)
+):
+    service = UsuarioService(session)
+    return await service.search(str(empresa_id), q.strip(), limit=limit, estado=estado)
 
 @router.get("/{usuario_id}", response_model=Usuario)
 async def get_usuario(
     usuario_id: UUID,
+    fields: str | None = Query(None, description="Campos a devolver, ej: nombre,email,custom_data.talla_camisa"),
     session: AsyncSession = Depends(get_db)
 ):
     service = UsuarioService(session)
+    if fields:
+        selection = fieldsets.parse_fields_param(fields, Usuario)
+        user = await service.get_fields_by_id(str(usuario_id), selection)
+        if not user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+        return fieldsets.render(Usuario, selection, user, many=False)
     user = await service.get_by_id(str(usuario_id))
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
-    return user
\ No newline at end of file
+    return user
+
+@router.delete("/{usuario_id}", response_model=Usuario)
+async def deactivate_usuario(
+    usuario_id: UUID,
+    session: AsyncSession = Depends(get_db)
+):
+    service = UsuarioService(session)
+    user = await service.deactivate(str(usuario_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return user
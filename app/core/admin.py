@@ -0,0 +1,19 @@
+import secrets
+
+from fastapi import Header, HTTPException
+
+from app.core.settings import settings
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def is_admin_token(token: str | None) -> bool:
+    """Sin ADMIN_TOKEN configurado ninguna petición se considera de administrador."""
+    if not settings.ADMIN_TOKEN or not token:
+        return False
+    return secrets.compare_digest(token, settings.ADMIN_TOKEN)
+
+
+async def require_admin(x_admin_token: str | None = Header(None)):
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Acceso restringido a administradores")
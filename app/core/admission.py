@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import re
+from collections import deque
+from typing import Any, Dict, Optional
+
+from starlette.responses import JSONResponse
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# POST que no escriben en la base: compiten por cupo con las lecturas, no
+# con las escrituras (el login tiene además su propio pool de bcrypt)
+READ_ONLY_ROUTES = (
+    ("POST", re.compile(r"/api/v1/usuarios/batch-get")),
+    ("POST", re.compile(r"/api/v1/entity-config/[^/]+/[^/]+/validate")),
+    ("POST", re.compile(r"/api/v1/auth/login")),
+)
+
+# Conexiones de larga duración o de operación que no deben ocupar cupos
+EXEMPT_PATHS = ("/health", "/api/v1/entity-config/events/", "/api/v1/admin/")
+
+REJECTED_QUEUE_FULL = "queue_full"
+REJECTED_TIMEOUT = "timeout"
+
+
+def is_write_request(method: str, path: str) -> bool:
+    if method in READ_METHODS:
+        return False
+    return not any(method == route_method and pattern.fullmatch(path) for route_method, pattern in READ_ONLY_ROUTES)
+
+
+def _class_name(is_write: bool) -> str:
+    return "write" if is_write else "read"
+
+
+class AdmissionController:
+    """
+    Limita las peticiones en curso por worker. Las escrituras tienen además
+    su propio tope (bcrypt, validación y commit son caros y toman conexiones
+    del pool) y, cuando se libera un cupo, las lecturas en espera pasan antes
+    que las escrituras. Si la cola está llena o la espera supera el timeout
+    la petición se rechaza en lugar de esperar DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self, max_concurrency: int, max_writes: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_writes = max_writes
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._active_writes = 0
+        self._queues = {False: deque(), True: deque()}
+        self._admitted = {False: 0, True: 0}
+        self._rejected = {False: {REJECTED_QUEUE_FULL: 0, REJECTED_TIMEOUT: 0}, True: {REJECTED_QUEUE_FULL: 0, REJECTED_TIMEOUT: 0}}
+        self._max_queue_depth = 0
+
+    def _has_slot(self, is_write: bool) -> bool:
+        return self._active < self.max_concurrency and (not is_write or self._active_writes < self.max_writes)
+
+    def _take(self, is_write: bool):
+        self._active += 1
+        self._active_writes += is_write
+        self._admitted[is_write] += 1
+
+    def _queue_depth(self) -> int:
+        return len(self._queues[False]) + len(self._queues[True])
+
+    async def acquire(self, is_write: bool) -> Optional[str]:
+        """None si la petición fue admitida; si no, el motivo del rechazo."""
+        nobody_ahead = not self._queues[False] and (not is_write or not self._queues[True])
+        if nobody_ahead and self._has_slot(is_write):
+            self._take(is_write)
+            return None
+
+        if self._queue_depth() >= self.max_queue:
+            self._rejected[is_write][REJECTED_QUEUE_FULL] += 1
+            return REJECTED_QUEUE_FULL
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._queues[is_write]
+        queue.append(waiter)
+        self._max_queue_depth = max(self._max_queue_depth, self._queue_depth())
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return None
+        except BaseException as exc:
+            # _wake pudo asignar el cupo en la misma vuelta del loop en que venció
+            # el timeout o llegó la cancelación (p. ej. el cliente se desconectó)
+            admitted = waiter.done() and not waiter.cancelled()
+            if isinstance(exc, asyncio.TimeoutError):
+                if admitted:
+                    return None
+                self._rejected[is_write][REJECTED_TIMEOUT] += 1
+                return REJECTED_TIMEOUT
+            if admitted:
+                self.release(is_write)
+            raise
+        finally:
+            if waiter in queue:
+                queue.remove(waiter)
+
+    def release(self, is_write: bool):
+        self._active -= 1
+        self._active_writes -= is_write
+        self._wake()
+
+    def _wake(self):
+        # Primero las lecturas, después las escrituras
+        for is_write in (False, True):
+            queue = self._queues[is_write]
+            while queue and self._has_slot(is_write):
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                self._take(is_write)
+                waiter.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "active_writes": self._active_writes,
+            "queued": {_class_name(is_write): len(queue) for is_write, queue in self._queues.items()},
+            "max_queue_depth": self._max_queue_depth,
+            "admitted": {_class_name(is_write): count for is_write, count in self._admitted.items()},
+            "rejected": {_class_name(is_write): dict(counts) for is_write, counts in self._rejected.items()},
+            "limits": {
+                "max_concurrency": self.max_concurrency,
+                "max_writes": self.max_writes,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+            },
+        }
+
+
+admission = AdmissionController(
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    max_writes=settings.ADMISSION_MAX_WRITES,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+)
+
+
+class AdmissionControlMiddleware:
+    """Aplica `admission` a cada petición HTTP; responde 503 con Retry-After al rechazar."""
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        is_write = is_write_request(scope["method"], scope["path"])
+        rejected = await self.controller.acquire(is_write)
+        if rejected:
+            logger.warning(f"Petición rechazada ({rejected}): {scope['method']} {scope['path']}")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Servidor ocupado, reintente en unos segundos"},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(is_write)
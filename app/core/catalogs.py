@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.models.catalog import Catalog, CatalogOption
+
+
+class CatalogValuesCache:
+    """
+    Valores de cada catálogo como frozenset, en memoria (por worker). Cada
+    consulta lee solo la versión del catálogo; las opciones se vuelven a
+    cargar cuando la versión cambió.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, frozenset]]" = OrderedDict()
+
+    async def get(self, session: AsyncSession, empresa_id, name: str) -> Optional[frozenset]:
+        """None si la empresa no tiene un catálogo con ese nombre."""
+        result = await session.execute(
+            select(Catalog.id, Catalog.version).where(Catalog.empresa_id == empresa_id, Catalog.name == name)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        key = (str(empresa_id), name)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == row.version:
+            self._entries.move_to_end(key)
+            return cached[1]
+
+        # Si el catálogo cambia entre ambas consultas, la próxima lectura ve
+        # una versión distinta y recarga
+        result = await session.execute(select(CatalogOption.value).where(CatalogOption.catalog_id == row.id))
+        values = frozenset(result.scalars().all())
+        self._entries[key] = (row.version, values)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return values
+
+
+catalog_values = CatalogValuesCache(maxsize=settings.CATALOG_CACHE_MAX_ENTRIES)
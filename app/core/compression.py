@@ -0,0 +1,202 @@
+import asyncio
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.settings import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Tipos que vale la pena comprimir; Parquet ya viaja comprimido y SSE necesita
+# que cada evento llegue apenas se emite
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml", "application/problem+json")
+EXCLUDED_TYPES = ("text/event-stream",)
+
+# Bloques más grandes se comprimen fuera del event loop
+THREAD_THRESHOLD = 256 * 1024
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders() -> Dict[str, Callable]:
+    """Codificaciones soportadas en orden de preferencia del servidor."""
+    encoders: Dict[str, Callable] = {}
+    if zstandard is not None:
+        encoders["zstd"] = _ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = _BrotliEncoder
+    encoders["gzip"] = _GzipEncoder
+    return encoders
+
+
+def negotiate(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """
+    Elige la codificación según `Accept-Encoding`: la de mayor q aceptada por
+    el cliente y, a igual q, la primera en `supported`.
+    """
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+
+    best = None
+    best_q = 0.0
+    for encoding in supported:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _is_compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.split(";")[0].endswith("+json")
+
+
+class CompressionMiddleware:
+    """
+    Comprime las respuestas con zstd, brotli o gzip (según lo que acepte el
+    cliente y los paquetes instalados) cuando superan COMPRESSION_MIN_SIZE.
+    Funciona también con StreamingResponse: cada bloque se comprime y se
+    vacía al cliente sin esperar al final de la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.encoders = available_encoders()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.encoders[encoding])
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send, encoding: str, encoder_factory: Callable):
+        self._send = send
+        self.encoding = encoding
+        self.encoder_factory = encoder_factory
+        self.start_message = None
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.encoder = None
+        # None: aún no se decide; False: se envía tal cual
+        self.compressing: Optional[bool] = None
+
+    async def send(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            if not _is_compressible(headers):
+                self.compressing = False
+                await self._send(message)
+            else:
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+            return
+
+        if message_type != "http.response.body" or self.compressing is False:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressing is None:
+            self.buffer.append(body)
+            self.buffered += len(body)
+            if self.buffered < settings.COMPRESSION_MIN_SIZE:
+                if more_body:
+                    return
+                # Respuesta completa por debajo del umbral: no vale la pena
+                self.compressing = False
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": b"".join(self.buffer)})
+                return
+            self.compressing = True
+            self.encoder = self.encoder_factory()
+            body = b"".join(self.buffer)
+            self.buffer = []
+            data = await self._compress(body, finish=not more_body)
+            headers = MutableHeaders(scope=self.start_message)
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                if "content-length" in headers:
+                    del headers["content-length"]
+            else:
+                headers["Content-Length"] = str(len(data))
+            await self._send(self.start_message)
+        else:
+            data = await self._compress(body, finish=not more_body)
+
+        if data or not more_body:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _compress(self, data: bytes, finish: bool) -> bytes:
+        if len(data) >= THREAD_THRESHOLD:
+            data = await asyncio.to_thread(self.encoder.compress, data)
+        else:
+            data = self.encoder.compress(data)
+        return data + self.encoder.finish() if finish else data
@@ -1,13 +1,16 @@
 import ssl
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable
 import logging
 import asyncio
+import contextlib
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.settings import settings
+from app.core.deadlines import statement_timeout_ms
+from app.core.validation_registry import validator_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -48,10 +51,45 @@ async_session = sessionmaker(
     autoflush=False
 )
 
+@event.listens_for(Session, "after_begin")
+def _set_statement_timeout(session, transaction, connection):
+    # SET LOCAL dura solo la transacción, así que se repite en cada una
+    timeout_ms = session.info.get("statement_timeout_ms")
+    if timeout_ms:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
+        # Timeout de la ruta (DeadlineRoute); fuera de una petición, el global
+        timeout_ms = statement_timeout_ms.get()
+        session.info["statement_timeout_ms"] = settings.DB_STATEMENT_TIMEOUT_MS if timeout_ms is None else timeout_ms
         yield session
 
+def shared_session_factory(session: AsyncSession) -> Callable:
+    """
+    Fábrica para ValidationContext que reutiliza la sesión de la petición (su
+    conexión y su statement_timeout) en lugar de tomar otra del pool. Los usos
+    se serializan, porque una AsyncSession no admite consultas concurrentes, y
+    cada uno corre en un SAVEPOINT para que un error o un timeout del validador
+    no aborte la transacción de la petición. La espera del lock no cuenta para
+    el timeout del validador: se reinicia al obtener la sesión.
+    """
+    lock = asyncio.Lock()
+
+    @contextlib.asynccontextmanager
+    async def factory():
+        current = validator_timeout.get()
+        if current is not None:
+            current[0].reschedule(None)
+        async with lock:
+            if current is not None:
+                deadline, seconds = current
+                deadline.reschedule(asyncio.get_running_loop().time() + seconds)
+            async with session.begin_nested():
+                yield session
+
+    return factory
+
 def get_sync_db():
     with Session(sync_engine) as session:
         yield session
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from sqlalchemy.exc import DBAPIError
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE query_canceled: statement_timeout o cancelación pedida por el cliente
+QUERY_CANCELED = "57014"
+
+# Status no estándar (nginx) para peticiones abandonadas por el cliente
+CLIENT_CLOSED_REQUEST = 499
+
+# Timeout de la petición en curso; lo lee get_db al abrir la sesión
+statement_timeout_ms: ContextVar[Optional[int]] = ContextVar("statement_timeout_ms", default=None)
+
+
+@dataclass(frozen=True)
+class RouteDeadline:
+    timeout_ms: Optional[int] = None
+    cancel_on_disconnect: bool = True
+
+
+def db_deadline(timeout_ms: Optional[int] = None, *, cancel_on_disconnect: bool = True) -> Callable:
+    """
+    Configura el statement_timeout de un endpoint (0 = sin límite) y si se
+    cancela al desconectarse el cliente. Va debajo del decorador de la ruta.
+    Los endpoints que leen `request.stream()` deben usar cancel_on_disconnect=False.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__db_deadline__ = RouteDeadline(timeout_ms, cancel_on_disconnect)
+        return endpoint
+    return decorator
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    return isinstance(exc, DBAPIError) and getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED
+
+
+class DeadlineRoute(APIRoute):
+    """
+    Ruta que propaga su statement_timeout a la sesión de get_db, cancela el
+    handler si el cliente se desconecta (la consulta en curso se cancela en
+    Postgres y la conexión vuelve al pool) y convierte los timeouts en 504.
+    Prioridad del timeout: DB_ROUTE_STATEMENT_TIMEOUTS_MS[nombre de la ruta],
+    luego @db_deadline y por último DB_STATEMENT_TIMEOUT_MS.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        deadline: RouteDeadline = getattr(self.endpoint, "__db_deadline__", RouteDeadline())
+        timeout_ms = settings.DB_ROUTE_STATEMENT_TIMEOUTS_MS.get(self.name, deadline.timeout_ms)
+        if timeout_ms is None:
+            timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+
+        async def deadline_handler(request: Request) -> Response:
+            token = statement_timeout_ms.set(timeout_ms)
+            try:
+                if deadline.cancel_on_disconnect:
+                    return await self._run_until_disconnect(handler, request)
+                return await handler(request)
+            except DBAPIError as exc:
+                if not is_statement_timeout(exc):
+                    raise
+                logger.warning(f"Consulta cancelada por statement_timeout ({timeout_ms} ms): {request.method} {request.url.path}")
+                return JSONResponse(
+                    status_code=504,
+                    content={"detail": "La consulta excedió el tiempo máximo permitido"},
+                )
+            finally:
+                statement_timeout_ms.reset(token)
+
+        return deadline_handler
+
+    @staticmethod
+    async def _run_until_disconnect(handler: Callable, request: Request) -> Response:
+        # El cuerpo se lee antes para que el vigilante no consuma sus mensajes;
+        # FastAPI reutiliza el cuerpo ya leído
+        await request.body()
+        task = asyncio.current_task()
+        disconnected = False
+
+        async def watch():
+            nonlocal disconnected
+            while True:
+                message = await request.receive()
+                if message["type"] == "http.disconnect":
+                    disconnected = True
+                    task.cancel()
+                    return
+
+        watcher = asyncio.create_task(watch())
+        try:
+            return await handler(request)
+        except asyncio.CancelledError:
+            # Otra cancelación (p. ej. apagado del servidor) se propaga
+            if not disconnected or task.cancelling() > 1:
+                raise
+            logger.info(f"Cliente desconectado, petición cancelada: {request.method} {request.url.path}")
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        finally:
+            watcher.cancel()
+            if disconnected:
+                task.uncancel()
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.db import async_session
+from app.core.settings import settings
+from app.models.usuario import Usuario
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+class EmailIndex:
+    """
+    Filtro de Bloom (por worker) con los emails existentes. Un resultado
+    negativo permite saltar la consulta a la base; uno positivo se confirma
+    siempre en la base. Cada EMAIL_FILTER_REFRESH_SECONDS se agregan los
+    emails creados o modificados desde la última lectura (índice sobre
+    modificado_en), así que un email registrado por otro worker puede
+    figurar como inexistente durante ese intervalo; una transacción que tarde
+    más que CHANGES_SAFETY_LAG_SECONDS en confirmarse recién se ve en la
+    reconstrucción completa (EMAIL_FILTER_REBUILD_SECONDS). La restricción
+    única de `usuarios.email` sigue siendo la garantía final, y el login no
+    usa el filtro.
+    """
+
+    def __init__(self):
+        self._filter: BloomFilter | None = None
+        # Emails insertados mientras se reconstruye el filtro
+        self._pending: set[str] | None = None
+        # Mayor modificado_en ya incorporado al filtro
+        self._watermark: datetime | None = None
+
+    @staticmethod
+    def _normalize(email: str) -> str:
+        return email.strip().lower()
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_exist(self, email: str) -> bool:
+        # Mientras no esté construido hay que consultar siempre la base
+        if self._filter is None:
+            return True
+        return self._normalize(email) in self._filter
+
+    def add(self, email: str):
+        email = self._normalize(email)
+        if self._filter is not None:
+            self._filter.add(email)
+        if self._pending is not None:
+            self._pending.add(email)
+
+    async def build(self):
+        started = time.monotonic()
+        self._pending = set()
+        try:
+            bloom, watermark = await self._load()
+            for email in self._pending:
+                bloom.add(email)
+        finally:
+            self._pending = None
+
+        self._filter = bloom
+        self._watermark = watermark
+        logger.info(f"Filtro de emails construido con {bloom.count} emails en {time.monotonic() - started:.1f}s")
+
+    async def _load(self) -> tuple[BloomFilter, datetime]:
+        async with async_session() as session:
+            # Mismo reloj y tipo que modificado_en; lo posterior lo trae refresh()
+            watermark = await session.scalar(select(func.localtimestamp()))
+            existing = await session.scalar(select(func.count()).select_from(Usuario))
+            bloom = BloomFilter(
+                capacity=max(existing * 2, settings.EMAIL_FILTER_MIN_CAPACITY),
+                error_rate=settings.EMAIL_FILTER_ERROR_RATE,
+            )
+            result = await session.stream_scalars(
+                select(Usuario.email).execution_options(yield_per=10000)
+            )
+            async for email in result:
+                bloom.add(self._normalize(email))
+        return bloom, watermark
+
+    async def refresh(self):
+        """Agrega los emails creados o modificados desde la última lectura."""
+        # Se relee un margen hacia atrás por las transacciones que confirman tarde
+        since = self._watermark - timedelta(seconds=settings.CHANGES_SAFETY_LAG_SECONDS)
+        async with async_session() as session:
+            result = await session.execute(
+                select(Usuario.email, Usuario.modificado_en).where(Usuario.modificado_en > since)
+            )
+            for email, modificado_en in result:
+                self._filter.add(self._normalize(email))
+                self._watermark = max(self._watermark, modificado_en)
+
+    async def run(self):
+        """
+        Construye el filtro al inicio, lo completa cada EMAIL_FILTER_REFRESH_SECONDS
+        y lo reconstruye cada EMAIL_FILTER_REBUILD_SECONDS.
+        """
+        built_at = None
+        while True:
+            try:
+                if built_at is None or time.monotonic() - built_at >= settings.EMAIL_FILTER_REBUILD_SECONDS:
+                    await self.build()
+                    built_at = time.monotonic()
+                else:
+                    await self.refresh()
+            except Exception as e:
+                logger.warning(f"No se pudo actualizar el filtro de emails: {e}")
+            await asyncio.sleep(settings.EMAIL_FILTER_REFRESH_SECONDS)
+
+
+email_index = EmailIndex()
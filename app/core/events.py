@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import asyncpg
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import async_session, connect_args, engine
+from app.core.settings import settings
+from app.models.entity_config import EntityConfig
+from app.schemas.entity_config import EntityConfig as EntityConfigSchema
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "entity_config_events"
+# Secuencia compartida: los ids de evento valen en cualquier worker
+SEQUENCE = "entity_config_event_seq"
+
+# Espera antes de reabrir la conexión de LISTEN caída
+RECONNECT_SECONDS = 5
+
+# Marca en la cola de un suscriptor: debe recargar la configuración
+_RESYNC = None
+
+
+class _Subscriber:
+    def __init__(self, empresa_id: str):
+        self.empresa_id = empresa_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SSE_BUFFER_SIZE)
+
+
+class EntityConfigEventBroker:
+    """
+    Difusión de cambios de EntityConfig hacia las conexiones SSE de cada
+    empresa. Cada cambio se anuncia con NOTIFY y cada worker lo recibe por
+    una conexión propia con LISTEN (`run`), así todos los clientes se
+    enteran sin importar qué worker atendió la escritura. El id de evento
+    sale de una secuencia de la base, de modo que un Last-Event-ID se puede
+    reproducir desde el historial corto de cualquier worker.
+    """
+
+    def __init__(self):
+        self._history: deque = deque(maxlen=settings.SSE_REPLAY_SIZE)
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        # Eventos con id mayor que este llegan al historial; None: sin LISTEN activo
+        self._floor: Optional[int] = None
+
+    async def publish(self, session: AsyncSession, config: EntityConfig, action: str):
+        """
+        Anuncia un cambio ya confirmado. El lock serializa a los que publican,
+        así los ids llegan a los workers en orden creciente.
+        """
+        await session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:channel))"), {"channel": CHANNEL})
+        await session.execute(
+            text(
+                "SELECT pg_notify(:channel, json_build_object("
+                f"'seq', nextval('{SEQUENCE}'), 'empresa_id', CAST(:empresa_id AS text), "
+                "'action', :action, 'id', :id)::text)"
+            ),
+            {"channel": CHANNEL, "empresa_id": str(config.empresa_id), "action": action, "id": config.id},
+        )
+        await session.commit()
+
+    def dispatch(self, seq: int, empresa_id: str, event: str, data: Dict[str, Any]):
+        message = (seq, event, json.dumps(data, default=str))
+        if len(self._history) == self._history.maxlen:
+            # El evento que sale del historial ya no se puede reproducir
+            self._floor = self._history[0][1][0]
+        self._history.append((empresa_id, message))
+        for subscriber in self._subscribers.get(empresa_id, ()):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Cliente lento: se descarta su buffer y se le pide recargar
+                self._resync(subscriber)
+
+    def reset(self, floor: Optional[int]):
+        """
+        Reinicia el historial al (re)abrir o perder la conexión de LISTEN; los
+        eventos intermedios pudieron perderse, así que todos deben recargar.
+        """
+        self._history.clear()
+        self._floor = floor
+        for subscribers in self._subscribers.values():
+            for subscriber in subscribers:
+                self._resync(subscriber)
+
+    @staticmethod
+    def _resync(subscriber: _Subscriber):
+        # Lo pendiente ya no sirve: el cliente recarga la configuración completa
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(_RESYNC)
+
+    def _replay(self, empresa_id: str, last_event_id: Optional[str]) -> Optional[List[tuple]]:
+        """Eventos posteriores a `last_event_id`, o None si ya no se pueden reconstruir."""
+        if self._floor is None or not (last_event_id or "").isdigit():
+            return None
+        last_seq = int(last_event_id)
+        if last_seq < self._floor:
+            return None
+        return [message for empresa, message in self._history if empresa == empresa_id and message[0] > last_seq]
+
+    async def stream(self, empresa_id: str, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        subscriber = _Subscriber(empresa_id)
+        self._subscribers.setdefault(empresa_id, set()).add(subscriber)
+        try:
+            yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+            last_seq = 0
+            if last_event_id:
+                missed = self._replay(empresa_id, last_event_id)
+                if missed is None:
+                    yield _format(None, "resync", "{}")
+                else:
+                    last_seq = int(last_event_id)
+                    for seq, event, data in missed:
+                        last_seq = seq
+                        yield _format(seq, event, data)
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if message is _RESYNC:
+                    yield _format(None, "resync", "{}")
+                    continue
+                seq, event, data = message
+                # Un evento pudo llegar tanto por la cola como por el historial
+                if seq <= last_seq:
+                    continue
+                last_seq = seq
+                yield _format(seq, event, data)
+        finally:
+            subscribers = self._subscribers.get(empresa_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[empresa_id]
+
+    async def run(self):
+        """Escucha el canal en una conexión propia (fuera del pool) y la reabre si se cae."""
+        while True:
+            try:
+                await self._listen()
+            except Exception as e:
+                logger.warning(f"Se perdió la escucha de eventos de configuración: {e}")
+            self.reset(None)
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def _listen(self):
+        notifications: asyncio.Queue = asyncio.Queue()
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = await asyncpg.connect(dsn, ssl=connect_args.get("ssl"))
+        try:
+            connection.add_termination_listener(lambda _: notifications.put_nowait(None))
+            await connection.add_listener(CHANNEL, lambda *args: notifications.put_nowait(args[3]))
+            # Todo id posterior a este se publica con el LISTEN ya activo
+            floor = await connection.fetchval(
+                f"SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END FROM {SEQUENCE}"
+            )
+            self.reset(floor)
+            while True:
+                payload = await notifications.get()
+                if payload is None:
+                    raise ConnectionError("conexión cerrada por el servidor")
+                notification = json.loads(payload)
+                data = await self._load(notification["id"])
+                if data is not None:
+                    self.dispatch(
+                        notification["seq"], notification["empresa_id"], "entity_config",
+                        {"action": notification["action"], **data},
+                    )
+        finally:
+            await connection.close()
+
+    @staticmethod
+    async def _load(config_id: int) -> Optional[Dict[str, Any]]:
+        # NOTIFY no admite payloads grandes: la configuración se lee de la base
+        async with async_session() as session:
+            config = await session.scalar(select(EntityConfig).where(EntityConfig.id == config_id))
+            if config is None:
+                return None
+            return EntityConfigSchema.model_validate(config).model_dump(mode="json")
+
+
+def _format(seq: Optional[int], event: str, data: str) -> str:
+    lines = []
+    if seq is not None:
+        lines.append(f"id: {seq}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+entity_config_events = EntityConfigEventBroker()
@@ -0,0 +1,145 @@
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.admin import ADMIN_TOKEN_HEADER, is_admin_token
+from app.core.db import engine
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_STATS_LIMIT = 50
+
+# Consultas SQL de la petición que se está perfilando (None fuera de un perfil)
+_current_queries: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("profiling_queries", default=None)
+
+_profiles: deque = deque(maxlen=settings.PROFILING_MAX_PROFILES)
+# cProfile es global al hilo: solo se perfila una petición a la vez
+_profiler_lock = asyncio.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_queries.get() is not None:
+        conn.info.setdefault("profiling_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current_queries.get()
+    if queries is None:
+        return
+    starts = conn.info.get("profiling_query_start")
+    if not starts:
+        return
+    queries.append({
+        "statement": statement,
+        "executemany": executemany,
+        "duration_ms": round((time.perf_counter() - starts.pop()) * 1000, 3),
+    })
+
+
+def install_sql_listeners():
+    """Registra los eventos de SQLAlchemy que miden cada sentencia del perfil activo."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    return [
+        {key: value for key, value in profile.items() if key not in ("sql", "stats")}
+        for profile in reversed(_profiles)
+    ]
+
+
+def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    for profile in _profiles:
+        if profile["id"] == profile_id:
+            return profile
+    return None
+
+
+def _format_stats(profiler: cProfile.Profile) -> str:
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_STATS_LIMIT)
+    return output.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+    Perfila bajo demanda las peticiones que traen `X-Profile: 1` y un token de
+    administrador válido. Guarda en memoria los últimos PROFILING_MAX_PROFILES
+    perfiles (cProfile + sentencias SQL con su duración).
+
+    Nota: cProfile observa todo el hilo del event loop, por lo que el perfil
+    puede incluir trabajo de otras peticiones concurrentes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if headers.get(PROFILE_HEADER) != "1" or not is_admin_token(headers.get(ADMIN_TOKEN_HEADER)):
+            await self.app(scope, receive, send)
+            return
+
+        if _profiler_lock.locked():
+            logger.info(f"Perfil omitido para {scope['path']}: ya hay otra petición en perfilado")
+            await self.app(scope, receive, send)
+            return
+
+        async with _profiler_lock:
+            await self._profile(scope, receive, send)
+
+    async def _profile(self, scope, receive, send):
+        profile_id = uuid.uuid4().hex
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        queries: List[Dict[str, Any]] = []
+        token = _current_queries.set(queries)
+        profiler = cProfile.Profile()
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start
+            _current_queries.reset(token)
+            _profiles.append({
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status_code": status_code,
+                "started_at": started_at.isoformat(),
+                "duration_ms": round(duration * 1000, 3),
+                "sql_count": len(queries),
+                "sql_total_ms": round(sum(q["duration_ms"] for q in queries), 3),
+                "sql": queries,
+                "stats": _format_stats(profiler),
+            })
@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.settings import settings
+
+USUARIOS = "usuarios"
+EMPRESAS = "empresas"
+
+
+class ResponseCache:
+    """
+    Respuestas JSON ya serializadas, en memoria (por worker). La clave incluye
+    un contador de versión por (espacio, empresa) que sube con cada escritura,
+    así una página cacheada deja de usarse en cuanto la empresa cambia; las
+    entradas viejas salen por LRU. El límite es en bytes, no en entradas.
+    Las escrituras de otros workers no suben estos contadores: el TTL acota
+    ese atraso.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int, max_entry_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._versions: Dict[Tuple[str, Optional[str]], int] = defaultdict(int)
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def key(self, namespace: str, empresa_id: Optional[Any], params: Hashable) -> Hashable:
+        """
+        Clave con la versión actual. Debe tomarse antes de consultar la base:
+        si hay una escritura mientras tanto, el resultado queda con la versión
+        anterior y no se vuelve a servir. Sin empresa_id se usa la versión del
+        espacio completo, que sube con la escritura de cualquier empresa.
+        """
+        tenant = str(empresa_id) if empresa_id is not None else None
+        return namespace, tenant, self._versions[(namespace, tenant)], params
+
+    def bump(self, namespace: str, empresa_id: Optional[Any] = None):
+        self._versions[(namespace, None)] += 1
+        if empresa_id is not None:
+            self._versions[(namespace, str(empresa_id))] += 1
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        item = self._entries.get(key)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                self._discard(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, body: bytes):
+        # Una página enorme desalojaría todo lo demás
+        if len(body) > self.max_entry_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = (time.monotonic() + self.ttl, body)
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _discard(self, key: Hashable):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._size -= len(item[1])
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "limits": {
+                "ttl": self.ttl,
+                "max_bytes": self.max_bytes,
+                "max_entry_bytes": self.max_entry_bytes,
+            },
+        }
+
+
+response_cache = ResponseCache(
+    ttl=settings.LIST_CACHE_TTL_SECONDS,
+    max_bytes=settings.LIST_CACHE_MAX_BYTES,
+    max_entry_bytes=settings.LIST_CACHE_MAX_ENTRY_BYTES,
+)
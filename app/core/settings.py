@@ -1,3 +1,4 @@
+from typing import Dict
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -9,6 +10,57 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_SSL_ENABLED: bool = False
     DB_CONNECT_TIMEOUT: int = 10
+    DB_STATEMENT_TIMEOUT_MS: int = 5000
+    DB_ROUTE_STATEMENT_TIMEOUTS_MS: Dict[str, int] = {}
+    CSV_IMPORT_BATCH_SIZE: int = 1000
+    CSV_IMPORT_MAX_RECORD_SIZE: int = 1024 * 1024
+    ADMIN_TOKEN: str = ""
+    PROFILING_ENABLED: bool = False
+    PROFILING_MAX_PROFILES: int = 20
+    CHANGES_SAFETY_LAG_SECONDS: int = 5
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_RETRY_MS: int = 3000
+    SSE_BUFFER_SIZE: int = 100
+    SSE_REPLAY_SIZE: int = 1000
+    VALIDATE_BATCH_MAX_ITEMS: int = 5000
+    ASYNC_VALIDATION_CONCURRENCY: int = 4
+    ASYNC_VALIDATION_TIMEOUT: float = 2.0
+    EXPORT_ROW_GROUP_SIZE: int = 50000
+    FACETS_CACHE_TTL_SECONDS: int = 30
+    EMAIL_FILTER_ENABLED: bool = True
+    EMAIL_FILTER_MIN_CAPACITY: int = 100000
+    EMAIL_FILTER_ERROR_RATE: float = 0.01
+    EMAIL_FILTER_REFRESH_SECONDS: int = 5
+    EMAIL_FILTER_REBUILD_SECONDS: int = 3600
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    REGEX_MAX_PATTERN_LENGTH: int = 500
+    REGEX_MAX_INPUT_LENGTH: int = 1000
+    REGEX_SLOW_MATCH_MS: float = 10.0
+    CATALOG_MAX_OPTIONS: int = 200000
+    CATALOG_CACHE_MAX_ENTRIES: int = 256
+    EMPRESA_CACHE_TTL_SECONDS: int = 60
+    LIST_CACHE_ENABLED: bool = True
+    LIST_CACHE_TTL_SECONDS: int = 30
+    LIST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LIST_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    LOGIN_ACCOUNT_MAX_FAILURES: int = 5
+    LOGIN_ACCOUNT_WINDOW_SECONDS: int = 900
+    LOGIN_IP_MAX_FAILURES: int = 50
+    LOGIN_IP_WINDOW_SECONDS: int = 300
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 64
+    ADMISSION_MAX_WRITES: int = 8
+    ADMISSION_MAX_QUEUE: int = 128
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict, deque
+from typing import Hashable
+
+
+class AttemptThrottle:
+    """
+    Ventana deslizante de intentos fallidos por clave (cuenta o IP), en memoria
+    y por worker. Guarda como máximo `max_keys` claves (LRU) para acotar la
+    memoria durante ataques con muchos emails distintos.
+    """
+
+    def __init__(self, max_failures: int, window_seconds: float, max_keys: int):
+        self.max_failures = max_failures
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._failures: "OrderedDict[Hashable, deque]" = OrderedDict()
+
+    def _recent(self, key: Hashable, now: float) -> deque:
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and failures[0] <= now - self.window_seconds:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+        return failures
+
+    def retry_after(self, key: Hashable) -> int:
+        """Segundos hasta el próximo intento permitido; 0 si no está bloqueada."""
+        now = time.monotonic()
+        failures = self._recent(key, now)
+        if len(failures) < self.max_failures:
+            return 0
+        return max(1, int(failures[0] + self.window_seconds - now) + 1)
+
+    def record_failure(self, key: Hashable):
+        now = time.monotonic()
+        failures = self._recent(key, now)
+        failures.append(now)
+        self._failures[key] = failures
+        self._failures.move_to_end(key)
+        while len(self._failures) > self.max_keys:
+            self._failures.popitem(last=False)
+
+    def reset(self, key: Hashable):
+        self._failures.pop(key, None)
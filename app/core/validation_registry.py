@@ -1,10 +1,38 @@
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Sequence, List, Tuple
+from contextvars import ContextVar
+from dataclasses import dataclass, field as dataclass_field
 from datetime import datetime, date
+import asyncio
+import inspect
+import json
+
+from sqlalchemy import text, column
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Timeout del validador asíncrono en curso y su duración en segundos;
+# shared_session_factory lo reinicia al obtener la sesión
+validator_timeout: ContextVar[Optional[Tuple[asyncio.Timeout, float]]] = ContextVar("validator_timeout", default=None)
+
+@dataclass
+class ValidationContext:
+    """
+    Contexto para validadores asíncronos. `session_factory` es un context
+    manager asíncrono que entrega una sesión; normalmente
+    `shared_session_factory(session)`, que reutiliza la de la petición y
+    serializa las consultas de validadores que corren en paralelo: el
+    timeout de cada validador empieza a correr cuando obtiene la sesión.
+    """
+    empresa_id: Any
+    entity_type: str
+    session_factory: Callable
+    # Emails de los registros que se están validando (se excluyen en chequeos de unicidad)
+    exclude_emails: Sequence[str] = dataclass_field(default_factory=tuple)
 
 class ValidationRegistry:
     _instance = None
     _validators: Dict[str, Callable] = {}
     _metadata: Dict[str, Dict[str, Any]] = {}
+    _async_options: Dict[str, Dict[str, Any]] = {}
 
     def __new__(cls):
         if cls._instance is None:
@@ -12,13 +40,29 @@ class ValidationRegistry:
         return cls._instance
 
     @classmethod
-    def register(cls, name: str, metadata: Dict[str, Any] = None):
+    def register(cls, name: str, metadata: Dict[str, Any] = None, timeout: Optional[float] = None, batch: bool = False):
+        """
+        Registra un validador. Las funciones `async` reciben además `field` y
+        `context` (ValidationContext) como argumentos nombrados; con `batch=True`
+        reciben la lista de valores de todos los registros y devuelven una lista
+        de booleanos en el mismo orden, para resolverlos con una sola consulta.
+        """
         def decorator(func: Callable):
             cls._validators[name] = func
+            if inspect.iscoroutinefunction(func):
+                cls._async_options[name] = {"timeout": timeout, "batch": batch}
             if metadata:
                 cls._metadata[name] = metadata
             return func
         return decorator
+
+    @classmethod
+    def is_async(cls, name: str) -> bool:
+        return name in cls._async_options
+
+    @classmethod
+    def get_async_options(cls, name: str) -> Dict[str, Any]:
+        return cls._async_options[name]
     
     @classmethod
     def get_all_metadata(cls) -> Dict[str, Dict[str, Any]]:
@@ -120,3 +164,42 @@ def date_comparation(value: Any, reference_date: str, operator: str) -> bool:
     elif operator == "neq":
         return val_date != ref_date
     return False
+
+# Validators with database access
+
+@ValidationRegistry.register("unique_in_empresa", metadata={
+    "label": "Valor único en la empresa",
+    "params": [],
+    "applicable_types": ["string", "integer", "email", "phone", "url"]
+}, batch=True)
+async def unique_in_empresa(values: List[Any], *, field: str, context: ValidationContext) -> List[bool]:
+    """
+    Checks that no other usuario of the empresa has the same custom_data value.
+    All values are resolved with a single containment query backed by the
+    custom_data GIN index; repeated values inside the batch also fail.
+    """
+    documents = [json.dumps({field: value}) for value in values]
+    async with context.session_factory() as session:
+        result = await session.execute(
+            text(
+                "SELECT DISTINCT custom_data -> :field AS valor FROM usuarios "
+                "WHERE empresa_id = CAST(:empresa_id AS uuid) "
+                "AND custom_data @> ANY(CAST(:documents AS jsonb[])) "
+                "AND NOT (email = ANY(CAST(:exclude_emails AS text[])))"
+            ).columns(column("valor", JSONB)),
+            {
+                "field": field,
+                "empresa_id": str(context.empresa_id),
+                "documents": documents,
+                "exclude_emails": list(context.exclude_emails),
+            }
+        )
+        taken = {json.dumps(value) for value in result.scalars().all()}
+
+    seen = set()
+    valid = []
+    for value in values:
+        key = json.dumps(value)
+        valid.append(key not in taken and key not in seen)
+        seen.add(key)
+    return valid
@@ -0,0 +1,76 @@
+from fastapi import HTTPException
+from sqlalchemy import select, delete, insert, update, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List, Set, Tuple
+from uuid import UUID
+from app.models.catalog import Catalog, CatalogOption
+from app.schemas.catalog import CatalogCreate, CatalogOptionIn
+
+class CatalogRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, data: CatalogCreate) -> Catalog:
+        catalog = Catalog(empresa_id=data.empresa_id, name=data.name)
+        self.session.add(catalog)
+        try:
+            await self.session.flush()
+        except IntegrityError:
+            await self.session.rollback()
+            raise HTTPException(status_code=409, detail="Ya existe un catálogo con ese nombre en la empresa")
+        await self._insert_options(catalog.id, data.options)
+        await self.session.commit()
+        await self.session.refresh(catalog)
+        return catalog
+
+    async def get_by_id(self, catalog_id: int) -> Catalog | None:
+        result = await self.session.execute(select(Catalog).where(Catalog.id == catalog_id))
+        return result.scalar_one_or_none()
+
+    async def list_by_empresa(self, empresa_id: UUID) -> List[Catalog]:
+        query = select(Catalog).where(Catalog.empresa_id == empresa_id).order_by(Catalog.name)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def existing_names(self, empresa_id: UUID, names: Iterable[str]) -> Set[str]:
+        query = select(Catalog.name).where(Catalog.empresa_id == empresa_id, Catalog.name.in_(list(names)))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def replace_options(self, catalog_id: int, options: List[CatalogOptionIn]) -> Catalog | None:
+        """Reemplaza todas las opciones en una transacción y sube la versión del catálogo."""
+        catalog = await self.session.get(Catalog, catalog_id, with_for_update=True)
+        if not catalog:
+            return None
+        await self.session.execute(delete(CatalogOption).where(CatalogOption.catalog_id == catalog_id))
+        await self._insert_options(catalog_id, options)
+        await self.session.execute(
+            update(Catalog).where(Catalog.id == catalog_id).values(version=Catalog.version + 1)
+        )
+        await self.session.commit()
+        await self.session.refresh(catalog)
+        return catalog
+
+    async def _insert_options(self, catalog_id: int, options: List[CatalogOptionIn]):
+        # Ante valores repetidos gana la última etiqueta
+        rows = {option.value: option.label for option in options}
+        if rows:
+            await self.session.execute(
+                insert(CatalogOption),
+                [{"catalog_id": catalog_id, "value": value, "label": label} for value, label in rows.items()]
+            )
+
+    async def search_options(self, catalog_id: int, q: str | None, skip: int, limit: int) -> Tuple[List[CatalogOption], bool]:
+        query = select(CatalogOption).where(CatalogOption.catalog_id == catalog_id)
+        if q:
+            escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            contains = f"%{escaped}%"
+            query = query.where(or_(
+                CatalogOption.label.ilike(contains, escape="\\"),
+                CatalogOption.value.ilike(contains, escape="\\"),
+            ))
+        query = query.order_by(CatalogOption.label, CatalogOption.value).offset(skip).limit(limit + 1)
+        result = await self.session.execute(query)
+        items = result.scalars().all()
+        return items[:limit], len(items) > limit
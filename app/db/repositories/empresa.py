@@ -1,7 +1,11 @@
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from app.models.empresa import Empresa
+from app.models.usuario import Usuario
 from app.schemas.empresa import EmpresaCreate
+from app.core.response_cache import response_cache, EMPRESAS
+from app.utils.fieldsets import FieldSelection, select_columns, row_to_dict
 
 class EmpresaRepository:
     def __init__(self, session: AsyncSession):
@@ -16,6 +20,7 @@ class EmpresaRepository:
         
         self.session.add(new_empresa)
         await self.session.commit()
+        response_cache.bump(EMPRESAS)
         await self.session.refresh(new_empresa)
         
         return new_empresa
@@ -25,7 +30,40 @@ class EmpresaRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def list_all(self) -> list[Empresa]:
-        query = select(Empresa)
+    async def get_detail(self, include_configs: bool, include_count: bool, empresa_id: str | None = None, nit: str | None = None) -> tuple[Empresa, int | None] | None:
+        """
+        Empresa por id o NIT en una sola consulta: las configuraciones con
+        joinedload y el conteo de usuarios como subconsulta escalar.
+        """
+        columns = [Empresa]
+        if include_count:
+            usuarios_count = (
+                select(func.count())
+                .where(Usuario.empresa_id == Empresa.id)
+                .correlate(Empresa)
+                .scalar_subquery()
+            )
+            columns.append(usuarios_count.label("usuarios_count"))
+        query = select(*columns)
+        if include_configs:
+            query = query.options(joinedload(Empresa.entity_configs))
+        if empresa_id is not None:
+            query = query.where(Empresa.id == empresa_id)
+        else:
+            query = query.where(Empresa.nit == nit)
+
+        result = await self.session.execute(query)
+        row = result.unique().one_or_none()
+        if row is None:
+            return None
+        return row[0], (row.usuarios_count if include_count else None)
+
+    async def list_all(self, skip: int = 0, limit: int = 100) -> list[Empresa]:
+        query = select(Empresa).order_by(Empresa.nombre, Empresa.id).offset(skip).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def list_all_fields(self, selection: FieldSelection, skip: int = 0, limit: int = 100) -> list[dict]:
+        query = select(*select_columns(Empresa, selection)).order_by(Empresa.nombre, Empresa.id).offset(skip).limit(limit)
         result = await self.session.execute(query)
-        return list(result.scalars().all())
\ No newline at end of file
+        return [row_to_dict(row, selection) for row in result.all()]
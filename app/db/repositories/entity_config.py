@@ -1,6 +1,9 @@
 from sqlalchemy import select
 from app.models.entity_config import EntityConfig
 from app.schemas.entity_config import EntityConfigCreate, EntityConfigUpdate
+from app.core.events import entity_config_events
+from app.db.repositories.catalog import CatalogRepository
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
@@ -8,7 +11,19 @@ class EntityConfigRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def _check_catalogs(self, empresa_id: UUID, config: dict):
+        names = {field["catalog"] for field in config.get("fields", []) if field.get("catalog")}
+        if not names:
+            return
+        missing = names - await CatalogRepository(self.session).existing_names(empresa_id, names)
+        if missing:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": "Catálogos inexistentes", "errors": sorted(missing)}
+            )
+
     async def create(self, data: EntityConfigCreate) -> EntityConfig:
+        await self._check_catalogs(data.empresa_id, data.config.model_dump())
         new_entity_config = EntityConfig(
             empresa_id=data.empresa_id,
             entity_type=data.entity_type,
@@ -18,6 +33,7 @@ class EntityConfigRepository:
         self.session.add(new_entity_config)
         await self.session.commit()
         await self.session.refresh(new_entity_config)
+        await self._publish("created", new_entity_config)
         
         return new_entity_config
 
@@ -31,15 +47,22 @@ class EntityConfigRepository:
             
         update_data = data.model_dump(exclude_unset=True)
         if "config" in update_data and update_data["config"]:
-            config.config = update_data["config"].model_dump() if hasattr(update_data["config"], "model_dump") else update_data["config"]
+            new_config = update_data["config"].model_dump() if hasattr(update_data["config"], "model_dump") else update_data["config"]
+            await self._check_catalogs(config.empresa_id, new_config)
+            config.config = new_config
             
         if "entity_type" in update_data:
             config.entity_type = update_data["entity_type"]
             
         await self.session.commit()
         await self.session.refresh(config)
+        await self._publish("updated", config)
         return config
 
+    async def _publish(self, action: str, config: EntityConfig):
+        # Solo después del commit, para no anunciar cambios que luego se revierten
+        await entity_config_events.publish(self.session, config, action)
+
     async def get_by_empresa_and_entity(self, empresa_id: UUID, entity_type: str) -> EntityConfig | None:
         query = select(EntityConfig).where(
             EntityConfig.empresa_id == empresa_id,
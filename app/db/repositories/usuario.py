@@ -1,17 +1,87 @@
-from sqlalchemy import select
+from sqlalchemy import select, update, text, func, or_, case, tuple_, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.usuario import Usuario
+from app.models.usuario import Usuario, ESTADO_INACTIVO
 from app.models.entity_config import EntityConfig
 from app.schemas.usuario import UsuarioCreate, UsuarioUpdate
-from app.utils.dynamic_validator import validate_custom_data
+from app.utils.dynamic_validator import validate_custom_data, format_validation_errors, run_async_validations
+from app.core.validation_registry import ValidationContext
+from app.core.db import shared_session_factory
+from app.core.email_index import email_index
+from app.core.response_cache import response_cache, USUARIOS
+from app.utils.security import hash_password_pooled
+from app.utils.fieldsets import FieldSelection, select_columns, row_to_dict
 from pydantic import ValidationError
 from fastapi import HTTPException
+from uuid import UUID
+from datetime import datetime, timedelta
+
+IMPORT_STAGING_TABLE = "usuarios_import_staging"
+
+# SQLSTATE de las violaciones de integridad que se traducen a respuestas HTTP
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+EMAIL_UNIQUE_CONSTRAINT = "usuarios_email_key"
+
+def _integrity_http_error(exc: IntegrityError) -> Exception:
+    """
+    HTTPException para el email duplicado (409) o la empresa inexistente (404);
+    cualquier otra violación se devuelve tal cual para que se propague.
+    """
+    sqlstate = getattr(exc.orig, "sqlstate", None)
+    constraint = getattr(exc.orig.__cause__, "constraint_name", None)
+    if sqlstate == UNIQUE_VIOLATION and constraint == EMAIL_UNIQUE_CONSTRAINT:
+        return HTTPException(status_code=409, detail="El email ya está registrado")
+    if sqlstate == FOREIGN_KEY_VIOLATION:
+        return HTTPException(status_code=404, detail="Empresa no encontrada")
+    return exc
 
 class UsuarioRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def email_exists(self, email: str) -> bool:
+        """Los negativos del filtro de Bloom no consultan la base; los positivos se confirman."""
+        if not email_index.might_exist(email):
+            return False
+        query = select(Usuario.id).where(Usuario.email == email).limit(1)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    async def existing_emails(self, emails: list[str]) -> set[str]:
+        """Los emails de la lista que ya están registrados (en cualquier empresa)."""
+        emails_param = bindparam("emails", list(set(emails)), type_=ARRAY(String))
+        result = await self.session.execute(select(Usuario.email).where(Usuario.email == any_(emails_param)))
+        return set(result.scalars().all())
+
+    async def get_login_credentials(self, email: str):
+        """(id, password, estado) por email; solo columnas de ix_usuarios_email_login."""
+        query = select(Usuario.id, Usuario.password, Usuario.estado).where(Usuario.email == email)
+        result = await self.session.execute(query)
+        return result.one_or_none()
+
+    async def replace_password_hash(self, usuario_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """Cambia el hash solo si no cambió mientras tanto (p. ej. un cambio de contraseña concurrente)."""
+        result = await self.session.execute(
+            update(Usuario)
+            .where(Usuario.id == usuario_id, Usuario.password == old_hash)
+            .values(password=new_hash)
+            .returning(Usuario.empresa_id)
+        )
+        empresa_id = result.scalar_one_or_none()
+        await self.session.commit()
+        if empresa_id is None:
+            return False
+        # modificado_en cambia, así que las páginas cacheadas también
+        response_cache.bump(USUARIOS, empresa_id)
+        return True
+
     async def create_with_config(self, data: UsuarioCreate) -> Usuario:
+        # 0. Rechazar emails duplicados antes de validar y calcular el hash
+        if await self.email_exists(data.email):
+            raise HTTPException(status_code=409, detail="El email ya está registrado")
+
         # 1. Buscar la configuración de entidades para este tipo (usuario) y empresa
         query = select(EntityConfig).where(
             EntityConfig.empresa_id == data.empresa_id,
@@ -25,25 +95,34 @@ class UsuarioRepository:
             try:
                 validate_custom_data(data.custom_data, entity_config.config)
             except ValidationError as e:
-                errors = []
-                for err in e.errors():
-                    err_copy = err.copy()
-                    if "ctx" in err_copy:
-                        del err_copy["ctx"]
-                    if "url" in err_copy:
-                        del err_copy["url"]
-                    errors.append(err_copy)
+                errors = format_validation_errors(e)
                 raise HTTPException(
                     status_code=400, 
                     detail={"message": "Error de validación dinámica", "errors": errors}
                 )
 
-        # 3. Crear el usuario
+            context = ValidationContext(empresa_id=data.empresa_id, entity_type="usuario", session_factory=shared_session_factory(self.session))
+            async_errors = await run_async_validations([data.custom_data], entity_config.config, context)
+            if async_errors:
+                raise HTTPException(
+                    status_code=400, 
+                    detail={"message": "Error de validación dinámica", "errors": async_errors[0]}
+                )
+
+        # 3. Crear el usuario (bcrypt en su pool, fuera del event loop)
         new_user = Usuario(**data.model_dump())
+        new_user.password = await hash_password_pooled(data.password)
         
         self.session.add(new_user)
-        await self.session.commit()
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            # Otro worker pudo insertar el mismo email después de la verificación
+            await self.session.rollback()
+            raise _integrity_http_error(e)
+        response_cache.bump(USUARIOS, new_user.empresa_id)
         await self.session.refresh(new_user)
+        email_index.add(new_user.email)
         
         return new_user
 
@@ -74,31 +153,217 @@ class UsuarioRepository:
                 try:
                     validate_custom_data(update_data["custom_data"], entity_config.config)
                 except ValidationError as e:
-                    errors = []
-                    for err in e.errors():
-                        err_copy = err.copy()
-                        if "ctx" in err_copy:
-                            del err_copy["ctx"]
-                        if "url" in err_copy:
-                            del err_copy["url"]
-                        errors.append(err_copy)
+                    errors = format_validation_errors(e)
                     raise HTTPException(
                         status_code=400, 
                         detail={"message": "Error de validación dinámica en actualización", "errors": errors}
                     )
 
-        # 3. Aplicar cambios
+                context = ValidationContext(
+                    empresa_id=usuario.empresa_id,
+                    entity_type="usuario",
+                    session_factory=shared_session_factory(self.session),
+                    exclude_emails=[usuario.email]
+                )
+                async_errors = await run_async_validations([update_data["custom_data"]], entity_config.config, context)
+                if async_errors:
+                    raise HTTPException(
+                        status_code=400, 
+                        detail={"message": "Error de validación dinámica en actualización", "errors": async_errors[0]}
+                    )
+
+        # 3. Aplicar cambios (bcrypt en su pool, fuera del event loop)
+        if "password" in update_data:
+            password = update_data.pop("password")
+            if password is not None:
+                update_data["password"] = await hash_password_pooled(password)
         for key, value in update_data.items():
             setattr(usuario, key, value)
 
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise _integrity_http_error(e)
+        response_cache.bump(USUARIOS, usuario.empresa_id)
+        await self.session.refresh(usuario)
+        if "email" in update_data:
+            email_index.add(usuario.email)
+        return usuario
+
+    async def deactivate(self, usuario_id: str) -> Usuario | None:
+        """Borrado lógico: marca el usuario como inactivo en lugar de eliminarlo."""
+        usuario = await self.get_by_id(usuario_id)
+        if not usuario:
+            return None
+
+        usuario.estado = ESTADO_INACTIVO
         await self.session.commit()
+        response_cache.bump(USUARIOS, usuario.empresa_id)
         await self.session.refresh(usuario)
         return usuario
 
-    async def get_all(self, skip: int = 0, limit: int = 100, empresa_id: str | None = None) -> list[Usuario]:
-        query = select(Usuario)
+    def _list_query(self, query, skip: int, limit: int, empresa_id: str | None, estado: int | None):
+        if empresa_id:
+            query = query.where(Usuario.empresa_id == empresa_id)
+        if estado is not None:
+            query = query.where(Usuario.estado == estado)
+        # El id desempata filas con el mismo creado_en (p. ej. un lote de importación),
+        # así las páginas con offset son estables. Con estado = 1 este orden se
+        # resuelve con el índice parcial ix_usuarios_activos_empresa_creado
+        return query.order_by(Usuario.creado_en, Usuario.id).offset(skip).limit(limit)
+
+    async def get_all(self, skip: int = 0, limit: int = 100, empresa_id: str | None = None, estado: int | None = None) -> list[Usuario]:
+        query = self._list_query(select(Usuario), skip, limit, empresa_id, estado)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_all_fields(self, selection: FieldSelection, skip: int = 0, limit: int = 100, empresa_id: str | None = None, estado: int | None = None) -> list[dict]:
+        """Como get_all, pero solo lee de Postgres las columnas pedidas."""
+        query = self._list_query(select(*select_columns(Usuario, selection)), skip, limit, empresa_id, estado)
+        result = await self.session.execute(query)
+        return [row_to_dict(row, selection) for row in result.all()]
+
+    async def get_many(self, ids: list[UUID], empresa_id: UUID | None = None) -> list[Usuario]:
+        """Una sola consulta `id = ANY(:ids)`; el orden del resultado no está definido."""
+        ids_param = bindparam("ids", list(set(ids)), type_=ARRAY(PG_UUID(as_uuid=True)))
+        query = select(Usuario).where(Usuario.id == any_(ids_param))
         if empresa_id:
             query = query.where(Usuario.empresa_id == empresa_id)
-        query = query.offset(skip).limit(limit)
         result = await self.session.execute(query)
         return list(result.scalars().all())
+
+    async def get_fields_by_id(self, usuario_id: str, selection: FieldSelection) -> dict | None:
+        query = select(*select_columns(Usuario, selection)).where(Usuario.id == usuario_id)
+        result = await self.session.execute(query)
+        row = result.one_or_none()
+        return row_to_dict(row, selection) if row else None
+
+    async def get_changes(self, empresa_id: str, since: tuple[datetime, UUID] | None = None, limit: int = 100, safety_lag: int = 0) -> list[Usuario]:
+        """
+        Usuarios modificados después de la posición (modificado_en, id) indicada,
+        en orden estable. Se excluyen los cambios de los últimos `safety_lag`
+        segundos para no saltar transacciones que aún no han hecho commit.
+        modificado_en es el clock_timestamp() de la escritura de la fila, así
+        que `safety_lag` debe cubrir la transacción de escritura más larga
+        (desde que escribe la fila hasta su commit): lo que confirme más tarde
+        queda detrás del cursor y no se entrega.
+        """
+        query = select(Usuario).where(Usuario.empresa_id == empresa_id)
+        if since:
+            query = query.where(tuple_(Usuario.modificado_en, Usuario.id) > tuple_(*since))
+        if safety_lag:
+            query = query.where(Usuario.modificado_en < func.localtimestamp() - timedelta(seconds=safety_lag))
+        query = query.order_by(Usuario.modificado_en, Usuario.id).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def count_select_values(self, empresa_id: str, keys: list[str], estado: int | None = None) -> tuple[int, list]:
+        """
+        Total de usuarios y conteo por (campo, valor) de las claves indicadas,
+        en una sola lectura de la tabla. Devuelve (total, [(campo, valor, cantidad)]).
+        """
+        estado_filter = "AND estado = :estado" if estado is not None else ""
+        result = await self.session.execute(
+            text(
+                f"""
+                WITH u AS MATERIALIZED (
+                    SELECT custom_data FROM usuarios
+                    WHERE empresa_id = CAST(:empresa_id AS uuid) {estado_filter}
+                )
+                SELECT NULL AS campo, NULL AS valor, count(*) AS cantidad FROM u
+                UNION ALL
+                SELECT kv.key, kv.value, count(*)
+                FROM u CROSS JOIN LATERAL jsonb_each_text(u.custom_data) AS kv
+                WHERE kv.key = ANY(CAST(:keys AS text[])) AND kv.value IS NOT NULL
+                GROUP BY kv.key, kv.value
+                """
+            ),
+            {"empresa_id": empresa_id, "keys": keys, **({"estado": estado} if estado is not None else {})}
+        )
+        total = 0
+        counts = []
+        for campo, valor, cantidad in result.all():
+            if campo is None:
+                total = cantidad
+            else:
+                counts.append((campo, valor, cantidad))
+        return total, counts
+
+    async def search(self, empresa_id: str, q: str, limit: int = 20, estado: int | None = None) -> list[Usuario]:
+        """
+        Búsqueda por nombre o email apoyada en los índices GIN de pg_trgm.
+        Primero las coincidencias por prefijo, luego por similitud.
+        """
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        prefix = f"{escaped}%"
+        contains = f"%{escaped}%"
+
+        query = select(Usuario).where(
+            Usuario.empresa_id == empresa_id,
+            or_(
+                Usuario.nombre.ilike(contains, escape="\\"),
+                Usuario.email.ilike(contains, escape="\\"),
+                Usuario.nombre.op("%")(q),
+                Usuario.email.op("%")(q),
+            )
+        )
+        if estado is not None:
+            query = query.where(Usuario.estado == estado)
+
+        is_prefix = or_(Usuario.nombre.ilike(prefix, escape="\\"), Usuario.email.ilike(prefix, escape="\\"))
+        query = query.order_by(
+            case((is_prefix, 0), else_=1),
+            func.greatest(func.similarity(Usuario.nombre, q), func.similarity(Usuario.email, q)).desc(),
+            Usuario.nombre,
+        ).limit(limit)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def bulk_upsert(self, empresa_id: UUID, rows: list[tuple]) -> set[str]:
+        """
+        Carga un lote con COPY a una tabla temporal y lo inserta con un único
+        INSERT ... SELECT ... ON CONFLICT (email).
+        `rows` son tuplas (fila, nombre, email, password, custom_data_json).
+        Devuelve los emails insertados o actualizados; un email que ya pertenece
+        a otra empresa no se modifica y por tanto no aparece en el resultado.
+        """
+        await self.session.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {IMPORT_STAGING_TABLE} ("
+            "fila integer, nombre text, email text, password text, custom_data text"
+            ") ON COMMIT DELETE ROWS"
+        ))
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            IMPORT_STAGING_TABLE,
+            records=rows,
+            columns=["fila", "nombre", "email", "password", "custom_data"],
+        )
+
+        # DISTINCT ON evita que un email repetido en el mismo lote afecte dos veces la misma fila
+        result = await self.session.execute(
+            text(
+                f"""
+                INSERT INTO usuarios (empresa_id, nombre, email, password, custom_data, estado)
+                SELECT DISTINCT ON (email) CAST(:empresa_id AS uuid), nombre, email, password, CAST(custom_data AS jsonb), 1
+                FROM {IMPORT_STAGING_TABLE}
+                ORDER BY email, fila DESC
+                ON CONFLICT (email) DO UPDATE
+                SET nombre = EXCLUDED.nombre,
+                    custom_data = EXCLUDED.custom_data,
+                    modificado_en = clock_timestamp()
+                WHERE usuarios.empresa_id = EXCLUDED.empresa_id
+                RETURNING email
+                """
+            ),
+            {"empresa_id": str(empresa_id)},
+        )
+        affected = set(result.scalars().all())
+        await self.session.commit()
+        if affected:
+            response_cache.bump(USUARIOS, empresa_id)
+        for email in affected:
+            email_index.add(email)
+        return affected
@@ -1,11 +1,37 @@
+import asyncio
+import contextlib
 from fastapi import FastAPI
 from app.api.v1 import router as v1_router
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.settings import settings
+from app.core.admission import AdmissionControlMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import ProfilingMiddleware, install_sql_listeners
+from app.core.email_index import email_index
+from app.core.events import entity_config_events
+from app.utils.security import dummy_hash
 
-app = FastAPI(title="API Usuarios")
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Eventos de configuración de los demás workers (LISTEN)
+    tasks = [asyncio.create_task(entity_config_events.run())]
+    # El filtro de emails se construye en segundo plano para no demorar el arranque
+    if settings.EMAIL_FILTER_ENABLED:
+        tasks.append(asyncio.create_task(email_index.run()))
+    # Se calcula antes del primer login con un email inexistente
+    await dummy_hash()
+    yield
+    for task in tasks:
+        task.cancel()
+
+app = FastAPI(title="API Usuarios", lifespan=lifespan)
 
 app.include_router(v1_router, prefix="/api/v1")
 
+# Dentro de CORS, para que los 503 también lleven las cabeceras CORS
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -14,6 +40,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.PROFILING_ENABLED:
+    install_sql_listeners()
+    app.add_middleware(ProfilingMiddleware)
+
 @app.get("/")
 def read_root():
     return {"message": "API de Usuarios con validación dinámica lista"}
@@ -2,5 +2,6 @@ from app.models.base import Base
 from app.models.usuario import Usuario
 from app.models.empresa import Empresa
 from app.models.entity_config import EntityConfig
+from app.models.catalog import Catalog, CatalogOption
 
-__all__ = ["Base", "Usuario", "Empresa", "EntityConfig"]
+__all__ = ["Base", "Usuario", "Empresa", "EntityConfig", "Catalog", "CatalogOption"]
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, Index, UniqueConstraint, DateTime
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.models.base import Base
+
+class Catalog(Base):
+    """Opciones de un campo select demasiado grandes para guardarlas en EntityConfig.config."""
+    __tablename__ = "catalogs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    empresa_id = Column(UUID(as_uuid=True), ForeignKey("empresas.id"), nullable=False)
+    name = Column(String, nullable=False)
+    # Se incrementa en cada reemplazo de opciones; invalida las cachés de valores
+    version = Column(Integer, nullable=False, server_default='1')
+    modificado_en = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    options = relationship("CatalogOption", back_populates="catalog", passive_deletes=True)
+
+    __table_args__ = (
+        UniqueConstraint('empresa_id', 'name', name='uq_catalog_empresa_name'),
+    )
+
+    def __repr__(self):
+        return f"<Catalog(empresa={self.empresa_id}, name='{self.name}', version={self.version})>"
+
+class CatalogOption(Base):
+    __tablename__ = "catalog_options"
+
+    catalog_id = Column(Integer, ForeignKey("catalogs.id", ondelete="CASCADE"), primary_key=True)
+    value = Column(String, primary_key=True)
+    label = Column(String, nullable=False)
+
+    catalog = relationship("Catalog", back_populates="options")
+
+    __table_args__ = (
+        Index('ix_catalog_options_catalog_label', 'catalog_id', 'label'),
+        Index('ix_catalog_options_label_trgm', 'label', postgresql_using='gin', postgresql_ops={'label': 'gin_trgm_ops'}),
+    )
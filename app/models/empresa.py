@@ -11,8 +11,9 @@ class Empresa(Base):
     nit = Column(String, unique=True, nullable=False)
     custom_data = Column(JSONB, default={})
 
-    usuarios = relationship("Usuario", back_populates="empresa")
-    entity_configs = relationship("EntityConfig", back_populates="empresa")
+    # En async la carga perezosa falla o genera N+1: se carga explícitamente (joinedload)
+    usuarios = relationship("Usuario", back_populates="empresa", lazy="raise")
+    entity_configs = relationship("EntityConfig", back_populates="empresa", lazy="raise")
 
     __table_args__ = (
         Index('ix_empresas_custom_data_gin', 'custom_data', postgresql_using='gin'),
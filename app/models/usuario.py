@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, ForeignKey, Index, DateTime, Integer
+from sqlalchemy import Column, String, ForeignKey, Index, DateTime, Integer, text
 from sqlalchemy.sql import func 
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from app.models.base import Base 
 
+ESTADO_ACTIVO = 1
+ESTADO_INACTIVO = 0
+
 class Usuario(Base):
     __tablename__ = "usuarios"
 
@@ -13,12 +16,21 @@ class Usuario(Base):
     email = Column(String, unique=True, nullable=False)
     custom_data = Column(JSONB, server_default='{}', nullable=False)
     password = Column(String, nullable=False)
-    estado = Column(Integer, nullable=False, default=1)
+    estado = Column(Integer, nullable=False, default=ESTADO_ACTIVO)
     creado_en = Column(DateTime, nullable=False, server_default=func.now())
+    # En la base lo fija el trigger trg_usuarios_modificado_en con clock_timestamp()
     modificado_en = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
     empresa = relationship("Empresa", back_populates="usuarios")
 
     __table_args__ = (
         Index('ix_usuarios_custom_data_gin', 'custom_data', postgresql_using='gin'),
+        Index('ix_usuarios_activos_empresa_creado', 'empresa_id', 'creado_en', 'id', postgresql_where=text('estado = 1')),
+        Index('ix_usuarios_nombre_trgm', 'nombre', postgresql_using='gin', postgresql_ops={'nombre': 'gin_trgm_ops'}),
+        Index('ix_usuarios_empresa_modificado_id', 'empresa_id', 'modificado_en', 'id'),
+        # Actualización incremental del filtro de emails (app/core/email_index.py)
+        Index('ix_usuarios_modificado_en', 'modificado_en'),
+        Index('ix_usuarios_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+        # Cubre la consulta de login: se resuelve con un index-only scan
+        Index('ix_usuarios_email_login', 'email', postgresql_include=['id', 'password', 'estado']),
     )
\ No newline at end of file
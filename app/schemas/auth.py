@@ -0,0 +1,5 @@
+from pydantic import BaseModel, EmailStr, Field
+
+class LoginRequest(BaseModel):
+    email: EmailStr
+    password: str = Field(..., min_length=1)
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List
+from uuid import UUID
+
+class CatalogOptionIn(BaseModel):
+    value: str = Field(..., min_length=1)
+    label: str
+
+class CatalogCreate(BaseModel):
+    empresa_id: UUID
+    name: str = Field(..., min_length=1, description="Nombre referenciado desde FieldDefinition.catalog")
+    options: List[CatalogOptionIn] = []
+
+class Catalog(BaseModel):
+    id: int
+    empresa_id: UUID
+    name: str
+    version: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CatalogOption(BaseModel):
+    value: str
+    label: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CatalogOptionPage(BaseModel):
+    version: int
+    items: List[CatalogOption]
+    has_more: bool
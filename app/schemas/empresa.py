@@ -1,6 +1,7 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
+from app.schemas.entity_config import EntityConfig
 
 class EmpresaBase(BaseModel):
     nombre: str
@@ -19,3 +20,8 @@ class Empresa(EmpresaBase):
     id: UUID
     
     model_config = ConfigDict(from_attributes=True)
+
+class EmpresaDetail(Empresa):
+    # Solo se completan si se piden con `include`
+    entity_configs: Optional[List[EntityConfig]] = None
+    usuarios_count: Optional[int] = None
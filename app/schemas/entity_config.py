@@ -1,7 +1,8 @@
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from typing import List, Optional, Union, Dict, Any
 from uuid import UUID
+from app.utils.safe_regex import find_pattern_problems
 
 class FieldTypeEnum(str, Enum):
     STRING = "string"
@@ -30,12 +31,35 @@ class FieldDefinition(BaseModel):
     type: FieldTypeEnum
     required: bool = False
     options: Optional[List[FieldOption]] = None # Solo en caso de select
+    catalog: Optional[str] = Field(None, description="Catálogo de la empresa con las opciones (select con muchas opciones)")
     regex: Optional[str] = None # Para validaciones avanzadas
     validations: Optional[List[ValidationRule]] = [] # Validaciones custom
 
+    @model_validator(mode="after")
+    def check_catalog(self):
+        if self.catalog is not None:
+            if self.type != FieldTypeEnum.SELECT:
+                raise ValueError("Solo los campos select pueden usar un catálogo")
+            if self.options:
+                raise ValueError("Un campo con catálogo no puede definir options")
+        return self
+
 class ConfigSchema(BaseModel):
     fields: List[FieldDefinition]
 
+def check_field_regexes(config: Optional[ConfigSchema]):
+    """
+    Rechaza regex inválidas o con backtracking exponencial. Solo se aplica al
+    guardar: las configuraciones ya almacenadas deben poder leerse siempre.
+    """
+    if config is None:
+        return
+    for field in config.fields:
+        if field.regex is not None:
+            problems = find_pattern_problems(field.regex)
+            if problems:
+                raise ValueError(f"Campo '{field.name}': {'; '.join(problems)}")
+
 class EntityConfigBase(BaseModel):
     entity_type: str
     config: ConfigSchema 
@@ -43,12 +67,31 @@ class EntityConfigBase(BaseModel):
 class EntityConfigCreate(EntityConfigBase):
     empresa_id: UUID
 
+    @model_validator(mode="after")
+    def check_regexes(self):
+        check_field_regexes(self.config)
+        return self
+
 class EntityConfigUpdate(BaseModel):
     entity_type: Optional[str] = None
     config: Optional[ConfigSchema] = None
 
+    @model_validator(mode="after")
+    def check_regexes(self):
+        check_field_regexes(self.config)
+        return self
+
 class EntityConfig(EntityConfigBase):
     id: int
     empresa_id: UUID
     
     model_config = ConfigDict(from_attributes=True)
+
+class ValidationItemErrors(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+class BatchValidationResult(BaseModel):
+    total: int
+    invalid: int
+    items: List[ValidationItemErrors] = Field(default_factory=list, description="Solo los elementos con errores")
@@ -1,8 +1,7 @@
-from typing import Optional, Any, Dict
-from pydantic import BaseModel, EmailStr, ConfigDict, field_validator
+from typing import Optional, Any, Dict, List
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
 from uuid import UUID
 from datetime import datetime
-from app.utils.security import hash_password
 
 class UsuarioBase(BaseModel):
     email: EmailStr
@@ -10,26 +9,22 @@ class UsuarioBase(BaseModel):
     custom_data: Dict[str, Any] = {}
 
 class UsuarioCreate(UsuarioBase):
+    # Texto plano: el hash se calcula en el repositorio, después de descartar emails duplicados
     password: str
     empresa_id: UUID
 
-    @field_validator("password")
-    @classmethod
-    def hash_raw_password(cls, v: str) -> str:
-        return hash_password(v)
-
 class UsuarioUpdate(BaseModel):
     email: Optional[EmailStr] = None
     custom_data: Optional[Dict[str, Any]] = None
     nombre: Optional[str] = None
+    # Texto plano: el hash se calcula en el repositorio, en el pool de bcrypt
     password: Optional[str] = None
 
-    @field_validator("password")
-    @classmethod
-    def hash_raw_password(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            return hash_password(v)
-        return v
+class UsuarioImportRow(BaseModel):
+    """Columnas fijas de una fila de importación CSV; el hash se calcula por lotes."""
+    email: EmailStr
+    nombre: str = Field(..., min_length=1)
+    password: str = Field(..., min_length=1)
 
 class Usuario(UsuarioBase):
     id: UUID
@@ -39,3 +34,40 @@ class Usuario(UsuarioBase):
     estado: int
     
     model_config = ConfigDict(from_attributes=True)
+
+BATCH_GET_MAX_IDS = 200
+
+class UsuarioBatchGet(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=BATCH_GET_MAX_IDS)
+    empresa_id: Optional[UUID] = Field(None, description="Si se indica, los usuarios de otras empresas se reportan como no encontrados")
+
+class UsuarioBatchItem(BaseModel):
+    id: UUID
+    found: bool
+    usuario: Optional[Usuario] = None
+
+class UsuarioBatchGetResult(BaseModel):
+    items: List[UsuarioBatchItem] = Field(..., description="En el mismo orden de `ids`, incluidos los repetidos")
+
+class UsuarioChanges(BaseModel):
+    items: List[Usuario]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+class FacetCount(BaseModel):
+    value: str
+    label: Optional[str] = None
+    count: int
+
+class FieldFacet(BaseModel):
+    label: str
+    counts: List[FacetCount]
+    missing: int
+
+class UsuarioFacets(BaseModel):
+    total: int
+    facets: Dict[str, FieldFacet]
+
+class EmailAvailability(BaseModel):
+    email: EmailStr
+    available: bool
@@ -0,0 +1,68 @@
+import logging
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.settings import settings
+from app.core.throttle import AttemptThrottle
+from app.db.repositories.usuario import UsuarioRepository
+from app.models.usuario import Usuario, ESTADO_ACTIVO
+from app.utils.security import (
+    PasswordPoolBusy, dummy_hash, hash_password, needs_rehash, password_pool_busy_error, run_in_password_pool, verify_password,
+)
+
+logger = logging.getLogger(__name__)
+
+_account_throttle = AttemptThrottle(
+    max_failures=settings.LOGIN_ACCOUNT_MAX_FAILURES,
+    window_seconds=settings.LOGIN_ACCOUNT_WINDOW_SECONDS,
+    max_keys=settings.LOGIN_THROTTLE_MAX_KEYS,
+)
+_ip_throttle = AttemptThrottle(
+    max_failures=settings.LOGIN_IP_MAX_FAILURES,
+    window_seconds=settings.LOGIN_IP_WINDOW_SECONDS,
+    max_keys=settings.LOGIN_THROTTLE_MAX_KEYS,
+)
+
+INVALID_CREDENTIALS = "Credenciales inválidas"
+
+
+class AuthService:
+    def __init__(self, session: AsyncSession):
+        self.repository = UsuarioRepository(session)
+
+    async def login(self, email: str, password: str, client_ip: str) -> Usuario:
+        account_key = email.lower()
+        retry_after = max(_account_throttle.retry_after(account_key), _ip_throttle.retry_after(client_ip))
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Demasiados intentos fallidos, intente más tarde",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+        # Sin el filtro de Bloom: puede no conocer aún un usuario registrado en otro
+        # worker, y la consulta (index-only scan) es despreciable frente al bcrypt
+        credentials = await self.repository.get_login_credentials(email)
+        try:
+            stored_hash = credentials.password if credentials else await dummy_hash()
+            valid = await run_in_password_pool(verify_password, password, stored_hash)
+        except PasswordPoolBusy:
+            raise password_pool_busy_error()
+
+        if not credentials or not valid or credentials.estado != ESTADO_ACTIVO:
+            _account_throttle.record_failure(account_key)
+            _ip_throttle.record_failure(client_ip)
+            raise HTTPException(status_code=401, detail=INVALID_CREDENTIALS)
+
+        _account_throttle.reset(account_key)
+        if needs_rehash(stored_hash):
+            await self._rehash(credentials.id, stored_hash, password)
+        return await self.repository.get_by_id(credentials.id)
+
+    async def _rehash(self, usuario_id, old_hash: str, password: str):
+        # El login ya fue exitoso: si el pool está ocupado se reintenta en el próximo
+        try:
+            new_hash = await run_in_password_pool(hash_password, password)
+        except PasswordPoolBusy:
+            return
+        if await self.repository.replace_password_hash(usuario_id, old_hash, new_hash):
+            logger.info(f"Hash de contraseña del usuario {usuario_id} actualizado a costo {settings.BCRYPT_ROUNDS}")
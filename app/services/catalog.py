@@ -0,0 +1,27 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from uuid import UUID
+from app.db.repositories.catalog import CatalogRepository
+from app.models.catalog import Catalog
+from app.schemas.catalog import CatalogCreate, CatalogOptionIn, CatalogOptionPage
+
+class CatalogService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = CatalogRepository(session)
+
+    async def create(self, data: CatalogCreate) -> Catalog:
+        return await self.repository.create(data)
+
+    async def list_by_empresa(self, empresa_id: UUID) -> List[Catalog]:
+        return await self.repository.list_by_empresa(empresa_id)
+
+    async def replace_options(self, catalog_id: int, options: List[CatalogOptionIn]) -> Catalog | None:
+        return await self.repository.replace_options(catalog_id, options)
+
+    async def get_options_page(self, catalog_id: int, q: str | None, skip: int, limit: int) -> CatalogOptionPage | None:
+        catalog = await self.repository.get_by_id(catalog_id)
+        if not catalog:
+            return None
+        items, has_more = await self.repository.search_options(catalog_id, q, skip, limit)
+        return CatalogOptionPage(version=catalog.version, items=items, has_more=has_more)
@@ -1,8 +1,31 @@
 from app.db.repositories.empresa import EmpresaRepository
-from app.schemas.empresa import EmpresaCreate
+from app.schemas.empresa import EmpresaCreate, EmpresaDetail, Empresa as EmpresaSchema
+from app.schemas.entity_config import EntityConfig as EntityConfigSchema
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.empresa import Empresa
-from typing import List
+from app.core.settings import settings
+from app.core.response_cache import response_cache, EMPRESAS
+from app.utils.cache import TTLCache
+from app.utils import fieldsets
+from app.utils.fieldsets import FieldSelection
+from pydantic import TypeAdapter
+from typing import List, Optional
+
+INCLUDE_ENTITY_CONFIGS = "entity_configs"
+INCLUDE_USUARIOS_COUNT = "usuarios_count"
+INCLUDE_OPTIONS = (INCLUDE_ENTITY_CONFIGS, INCLUDE_USUARIOS_COUNT)
+
+# Detalle serializado por (id, include); el NIT solo guarda el id correspondiente
+_detail_cache = TTLCache(ttl=settings.EMPRESA_CACHE_TTL_SECONDS)
+_nit_cache = TTLCache(ttl=settings.EMPRESA_CACHE_TTL_SECONDS)
+_empresa_list = TypeAdapter(List[EmpresaSchema])
+
+
+def invalidate_empresa_cache(empresa_id: str):
+    """Descarta en este worker el detalle cacheado de la empresa (todas las variantes de include)."""
+    for include_configs in (False, True):
+        for include_count in (False, True):
+            _detail_cache.invalidate((str(empresa_id), include_configs, include_count))
 
 
 class EmpresaService:
@@ -17,6 +40,58 @@ class EmpresaService:
         repository = EmpresaRepository(self.session)
         return await repository.get_by_id(empresa_id)
 
-    async def list_all(self) -> List[Empresa]:
+    async def get_detail(self, include: frozenset, empresa_id: Optional[str] = None, nit: Optional[str] = None) -> EmpresaDetail | None:
+        """
+        Detalle por id o NIT servido desde una caché de vida corta. El conteo de
+        usuarios y las configuraciones pueden tener hasta
+        EMPRESA_CACHE_TTL_SECONDS de atraso.
+        """
+        include_configs = INCLUDE_ENTITY_CONFIGS in include
+        include_count = INCLUDE_USUARIOS_COUNT in include
+        if empresa_id is None:
+            empresa_id = _nit_cache.get(nit)
+        if empresa_id is not None:
+            cached = _detail_cache.get((str(empresa_id), include_configs, include_count))
+            if cached is not None:
+                return cached
+
+        repository = EmpresaRepository(self.session)
+        found = await repository.get_detail(include_configs, include_count, empresa_id=empresa_id, nit=nit)
+        if found is None:
+            # Los faltantes no se cachean: la empresa puede crearse en cualquier momento
+            return None
+        empresa, usuarios_count = found
+        detail = EmpresaDetail(
+            **EmpresaSchema.model_validate(empresa).model_dump(),
+            entity_configs=[EntityConfigSchema.model_validate(config) for config in empresa.entity_configs] if include_configs else None,
+            usuarios_count=usuarios_count,
+        )
+        _detail_cache.set((str(empresa.id), include_configs, include_count), detail)
+        _nit_cache.set(empresa.nit, str(empresa.id))
+        return detail
+
+    async def list_all(self, skip: int = 0, limit: int = 100) -> List[Empresa]:
+        repository = EmpresaRepository(self.session)
+        return await repository.list_all(skip, limit)
+
+    async def list_all_fields(self, selection: FieldSelection, skip: int = 0, limit: int = 100) -> List[dict]:
         repository = EmpresaRepository(self.session)
-        return await repository.list_all()
+        return await repository.list_all_fields(selection, skip, limit)
+
+    async def list_all_json(self, selection: Optional[FieldSelection] = None, skip: int = 0, limit: int = 100) -> bytes:
+        """Página del listado ya serializada, servida desde response_cache hasta la siguiente escritura de empresas."""
+        key = response_cache.key(EMPRESAS, None, ("list", skip, limit, selection))
+        if settings.LIST_CACHE_ENABLED:
+            body = response_cache.get(key)
+            if body is not None:
+                return body
+
+        if selection:
+            body = fieldsets.render_json(EmpresaSchema, selection, await self.list_all_fields(selection, skip, limit))
+        else:
+            rows = await self.list_all(skip, limit)
+            body = _empresa_list.dump_json(_empresa_list.validate_python(rows, from_attributes=True))
+
+        if settings.LIST_CACHE_ENABLED:
+            response_cache.set(key, body)
+        return body
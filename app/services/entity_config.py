@@ -1,6 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.entity_config import EntityConfigCreate, EntityConfigUpdate
+from app.schemas.entity_config import EntityConfigCreate, EntityConfigUpdate, BatchValidationResult, ValidationItemErrors
+from app.utils.json_schema import config_to_json_schema, schema_hash
+from app.utils.dynamic_validator import get_dynamic_model, validate_custom_data, format_validation_errors, run_async_validations
+from app.core.validation_registry import ValidationContext
+from app.core.db import shared_session_factory
+from pydantic import ValidationError
+from typing import Any, Dict, List, Tuple
+import asyncio
 from app.db.repositories.entity_config import EntityConfigRepository
+from app.services.empresa import invalidate_empresa_cache
 from app.models.entity_config import EntityConfig
 from uuid import UUID
 
@@ -10,10 +18,52 @@ class EntityConfigService:
         self.repository = EntityConfigRepository(session)
 
     async def create(self, data: EntityConfigCreate) -> EntityConfig:
-        return await self.repository.create(data)
+        config = await self.repository.create(data)
+        invalidate_empresa_cache(str(config.empresa_id))
+        return config
 
     async def update(self, config_id: int, data: EntityConfigUpdate) -> EntityConfig | None:
-        return await self.repository.update(config_id, data)
+        config = await self.repository.update(config_id, data)
+        if config:
+            invalidate_empresa_cache(str(config.empresa_id))
+        return config
 
     async def get_config(self, empresa_id: UUID, entity_type: str) -> EntityConfig | None:
-        return await self.repository.get_by_empresa_and_entity(empresa_id, entity_type)
\ No newline at end of file
+        return await self.repository.get_by_empresa_and_entity(empresa_id, entity_type)
+
+    async def get_json_schema(self, empresa_id: UUID, entity_type: str) -> Tuple[Dict[str, Any], str] | None:
+        """JSON Schema de custom_data y el hash de su contenido (la versión)."""
+        config = await self.repository.get_by_empresa_and_entity(empresa_id, entity_type)
+        if not config:
+            return None
+        schema = config_to_json_schema(config.config, title=f"{entity_type}.custom_data")
+        return schema, schema_hash(schema)
+
+    async def validate_batch(self, empresa_id: UUID, entity_type: str, items: List[Dict[str, Any]]) -> BatchValidationResult | None:
+        """Valida sin escribir; el modelo dinámico se construye una sola vez para todo el lote."""
+        config = await self.repository.get_by_empresa_and_entity(empresa_id, entity_type)
+        if not config:
+            return None
+        # Validar miles de elementos es trabajo de CPU: se saca del event loop
+        errors = await asyncio.to_thread(_validate_items, config.config, items)
+
+        # Los validadores asíncronos solo revisan lo que pasó la validación básica
+        valid_indexes = [index for index in range(len(items)) if index not in errors]
+        context = ValidationContext(empresa_id=empresa_id, entity_type=entity_type, session_factory=shared_session_factory(self.session))
+        async_errors = await run_async_validations([items[i] for i in valid_indexes], config.config, context)
+        for position, item_errors in async_errors.items():
+            errors[valid_indexes[position]] = item_errors
+
+        invalid = [ValidationItemErrors(index=index, errors=errors[index]) for index in sorted(errors)]
+        return BatchValidationResult(total=len(items), invalid=len(invalid), items=invalid)
+
+
+def _validate_items(config_schema: Dict[str, Any], items: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    dynamic_model = get_dynamic_model(config_schema.get('fields', []))
+    errors = {}
+    for index, custom_data in enumerate(items):
+        try:
+            validate_custom_data(custom_data, config_schema, dynamic_model)
+        except ValidationError as e:
+            errors[index] = format_validation_errors(e)
+    return errors
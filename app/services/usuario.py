@@ -1,20 +1,125 @@
 from app.db.repositories.usuario import UsuarioRepository
-from app.schemas.usuario import UsuarioCreate, UsuarioUpdate
+from app.db.repositories.entity_config import EntityConfigRepository
+from app.schemas.usuario import UsuarioCreate, UsuarioUpdate, UsuarioChanges, UsuarioFacets, FieldFacet, FacetCount, UsuarioBatchGet, UsuarioBatchGetResult, UsuarioBatchItem, Usuario as UsuarioSchema
+from app.utils.cache import TTLCache
+from app.core.settings import settings
+from app.core.response_cache import response_cache, USUARIOS
+from app.utils.cursor import encode_cursor, decode_cursor
 from app.models.usuario import Usuario
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils import fieldsets
+from app.utils.fieldsets import FieldSelection
+from pydantic import TypeAdapter
+from typing import Optional
+
+_facets_cache = TTLCache(ttl=settings.FACETS_CACHE_TTL_SECONDS)
+_usuario_list = TypeAdapter(list[UsuarioSchema])
 
 class UsuarioService:
     def __init__(self, session: AsyncSession):
         self.repository = UsuarioRepository(session)
+        self.config_repository = EntityConfigRepository(session)
 
     async def create_with_config(self, data: UsuarioCreate) -> Usuario:
         return await self.repository.create_with_config(data)
 
+    async def is_email_available(self, email: str) -> bool:
+        return not await self.repository.email_exists(email)
+
     async def get_by_id(self, usuario_id: str) -> Usuario | None:
         return await self.repository.get_by_id(usuario_id)
 
+    async def get_fields_by_id(self, usuario_id: str, selection: FieldSelection) -> dict | None:
+        return await self.repository.get_fields_by_id(usuario_id, selection)
+
+    async def batch_get(self, data: UsuarioBatchGet) -> UsuarioBatchGetResult:
+        usuarios = {usuario.id: usuario for usuario in await self.repository.get_many(data.ids, data.empresa_id)}
+        return UsuarioBatchGetResult(items=[
+            UsuarioBatchItem(id=usuario_id, found=usuario_id in usuarios, usuario=usuarios.get(usuario_id))
+            for usuario_id in data.ids
+        ])
+
     async def update(self, usuario_id: str, data: UsuarioUpdate) -> Usuario | None:
         return await self.repository.update(usuario_id, data)
 
-    async def get_all(self, skip: int = 0, limit: int = 100, empresa_id: str | None = None) -> list[Usuario]:
-        return await self.repository.get_all(skip=skip, limit=limit, empresa_id=empresa_id)
\ No newline at end of file
+    async def get_changes(self, empresa_id: str, since: str | None = None, limit: int = 100) -> UsuarioChanges:
+        position = decode_cursor(since) if since else None
+        # Se pide uno extra para saber si hay más páginas
+        items = await self.repository.get_changes(
+            empresa_id, position, limit=limit + 1, safety_lag=settings.CHANGES_SAFETY_LAG_SECONDS
+        )
+        has_more = len(items) > limit
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].modificado_en, items[-1].id) if items else since
+        return UsuarioChanges(items=items, next_cursor=next_cursor, has_more=has_more)
+
+    async def get_facets(self, empresa_id: str, estado: int | None = None) -> UsuarioFacets:
+        """Conteo de usuarios por valor de cada campo select, con caché de vida corta."""
+        cache_key = (empresa_id, estado)
+        cached = _facets_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        config = await self.config_repository.get_by_empresa_and_entity(empresa_id, "usuario")
+        select_fields = [
+            field for field in (config.config.get("fields", []) if config else [])
+            if field.get("type") == "select"
+        ]
+        total, rows = await self.repository.count_select_values(
+            empresa_id, [field["name"] for field in select_fields], estado=estado
+        )
+
+        counts_by_field: dict = {}
+        for campo, valor, cantidad in rows:
+            counts_by_field.setdefault(campo, {})[valor] = cantidad
+
+        facets = {}
+        for field in select_fields:
+            counts = counts_by_field.get(field["name"], {})
+            labels = {str(opt["value"]): opt.get("label") for opt in field.get("options") or []}
+            # Las opciones sin usuarios también se listan, con cantidad 0
+            values = list(labels) + [value for value in counts if value not in labels]
+            facets[field["name"]] = FieldFacet(
+                label=field.get("label", field["name"]),
+                counts=[FacetCount(value=value, label=labels.get(value), count=counts.get(value, 0)) for value in values],
+                missing=total - sum(counts.values()),
+            )
+
+        result = UsuarioFacets(total=total, facets=facets)
+        _facets_cache.set(cache_key, result)
+        return result
+
+    async def search(self, empresa_id: str, q: str, limit: int = 20, estado: int | None = None) -> list[Usuario]:
+        return await self.repository.search(empresa_id, q, limit=limit, estado=estado)
+
+    async def deactivate(self, usuario_id: str) -> Usuario | None:
+        return await self.repository.deactivate(usuario_id)
+
+    async def get_all(self, skip: int = 0, limit: int = 100, empresa_id: str | None = None, estado: int | None = None) -> list[Usuario]:
+        return await self.repository.get_all(skip=skip, limit=limit, empresa_id=empresa_id, estado=estado)
+
+    async def get_all_fields(self, selection: FieldSelection, skip: int = 0, limit: int = 100, empresa_id: str | None = None, estado: int | None = None) -> list[dict]:
+        return await self.repository.get_all_fields(selection, skip=skip, limit=limit, empresa_id=empresa_id, estado=estado)
+
+    async def get_all_json(self, selection: Optional[FieldSelection] = None, skip: int = 0, limit: int = 100, empresa_id: str | None = None, estado: int | None = None) -> bytes:
+        """
+        Página del listado ya serializada. Se sirve desde response_cache hasta
+        la siguiente escritura de usuarios de la empresa (o de cualquier
+        empresa, si no se filtra por una).
+        """
+        key = response_cache.key(USUARIOS, empresa_id, ("list", skip, limit, estado, selection))
+        if settings.LIST_CACHE_ENABLED:
+            body = response_cache.get(key)
+            if body is not None:
+                return body
+
+        if selection:
+            rows = await self.get_all_fields(selection, skip=skip, limit=limit, empresa_id=empresa_id, estado=estado)
+            body = fieldsets.render_json(UsuarioSchema, selection, rows)
+        else:
+            rows = await self.get_all(skip=skip, limit=limit, empresa_id=empresa_id, estado=estado)
+            body = _usuario_list.dump_json(_usuario_list.validate_python(rows, from_attributes=True))
+
+        if settings.LIST_CACHE_ENABLED:
+            response_cache.set(key, body)
+        return body
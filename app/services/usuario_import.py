@@ -0,0 +1,188 @@
+import csv
+import io
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from app.core.db import async_session, shared_session_factory
+from app.core.settings import settings
+from app.db.repositories.usuario import UsuarioRepository
+from app.schemas.usuario import UsuarioImportRow
+from app.utils.csv_stream import CsvStreamReader, CsvRecordTooLarge
+from app.utils.dynamic_validator import get_dynamic_model, validate_custom_data, run_async_validations
+from app.core.validation_registry import ValidationContext
+from app.utils.security import hash_passwords_pooled
+
+logger = logging.getLogger(__name__)
+
+BASE_COLUMNS = ("email", "nombre", "password")
+ERROR_COLUMNS = ("fila", "campo", "error")
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# Va en la columna password de las filas que actualizan un usuario existente,
+# donde nunca se escribe; no es un hash bcrypt, así que no verificaría ninguna contraseña
+UNUSED_PASSWORD = "!"
+
+
+def _csv_line(values) -> str:
+    output = io.StringIO()
+    csv.writer(output).writerow(values)
+    return output.getvalue()
+
+
+def _is_bcrypt_hash(password: str) -> bool:
+    return password.startswith(BCRYPT_PREFIXES) and len(password) == 60
+
+
+async def _hash_passwords(passwords: List[str]) -> List[str]:
+    # Se aceptan hashes bcrypt ya calculados (migraciones desde otros sistemas)
+    raw = [p for p in passwords if not _is_bcrypt_hash(p)]
+    hashed = iter(await hash_passwords_pooled(raw))
+    return [p if _is_bcrypt_hash(p) else next(hashed) for p in passwords]
+
+
+class UsuarioImportService:
+    """
+    Importa usuarios desde un CSV en streaming: valida las filas por lotes con
+    un único modelo dinámico, carga las válidas con COPY y devuelve un CSV con
+    los errores por fila a medida que se procesa cada lote.
+    """
+
+    def __init__(self, empresa_id: UUID, config_schema: Optional[Dict[str, Any]]):
+        self.empresa_id = empresa_id
+        self.config_schema = config_schema
+        fields_def = config_schema.get("fields", []) if config_schema else []
+        self.field_names = {field["name"] for field in fields_def}
+        self.dynamic_model = get_dynamic_model(fields_def) if config_schema else None
+
+    def check_header(self, header: List[str]) -> List[str]:
+        errors = []
+        missing = [column for column in BASE_COLUMNS if column not in header]
+        if missing:
+            errors.append(f"Faltan columnas obligatorias: {', '.join(missing)}")
+        duplicated = sorted({column for column in header if header.count(column) > 1})
+        if duplicated:
+            errors.append(f"Columnas duplicadas: {', '.join(duplicated)}")
+        return errors
+
+    def _custom_columns(self, header: List[str]) -> List[str]:
+        # Sin configuración se guardan todas las columnas extra como texto
+        if self.config_schema is None:
+            return [column for column in header if column not in BASE_COLUMNS]
+        return [column for column in header if column in self.field_names]
+
+    def _validate_row(self, header: List[str], custom_columns: List[str], values: Optional[List[str]]):
+        if values is None:
+            return None, [("", "Registro CSV mal formado")]
+        if len(values) != len(header):
+            return None, [("", f"Se esperaban {len(header)} columnas y se recibieron {len(values)}")]
+
+        record = dict(zip(header, values))
+        errors: List[Tuple[str, str]] = []
+
+        try:
+            base = UsuarioImportRow.model_validate({column: record[column].strip() for column in BASE_COLUMNS})
+        except ValidationError as e:
+            base = None
+            errors.extend((str(err["loc"][-1]), err["msg"]) for err in e.errors())
+
+        custom_data = {
+            column: record[column].strip()
+            for column in custom_columns
+            if record[column].strip() != ""
+        }
+        if self.dynamic_model is not None:
+            try:
+                validated = validate_custom_data(custom_data, self.config_schema, self.dynamic_model)
+                custom_data = validated.model_dump(mode="json", exclude_none=True)
+            except ValidationError as e:
+                errors.extend((str(err["loc"][-1]), err["msg"]) for err in e.errors())
+
+        if errors:
+            return None, errors
+        return (base, custom_data), []
+
+    async def _run_async_validations(self, session, valid: list, error_rows: list) -> list:
+        # Un solo llamado por validador para todo el lote (p. ej. unicidad con ANY)
+        context = ValidationContext(
+            empresa_id=self.empresa_id,
+            entity_type="usuario",
+            session_factory=shared_session_factory(session),
+            exclude_emails=[base.email for _, base, _ in valid]
+        )
+        async_errors = await run_async_validations(
+            [custom_data for _, _, custom_data in valid], self.config_schema, context
+        )
+        for index, errors in async_errors.items():
+            row_number = valid[index][0]
+            error_rows.extend((row_number, str(err["loc"][-1]), err["msg"]) for err in errors)
+        return [row for index, row in enumerate(valid) if index not in async_errors]
+
+    async def run(self, reader: CsvStreamReader, header: List[str]) -> AsyncIterator[str]:
+        yield _csv_line(ERROR_COLUMNS)
+
+        custom_columns = self._custom_columns(header)
+        started = time.monotonic()
+        total_rows = 0
+        imported = 0
+        failed = 0
+
+        # La sesión de la petición ya está cerrada cuando se transmite la respuesta
+        async with async_session() as session:
+            repository = UsuarioRepository(session)
+            batches = reader.batches(settings.CSV_IMPORT_BATCH_SIZE)
+            while True:
+                try:
+                    batch = await anext(batches)
+                except StopAsyncIteration:
+                    break
+                except CsvRecordTooLarge as e:
+                    # Sin el cierre de comillas no se puede seguir leyendo el archivo
+                    failed += 1
+                    yield _csv_line((e.row_number, "registro", str(e)))
+                    break
+                total_rows += len(batch)
+                error_rows = []
+                valid = []
+                for row_number, values in batch:
+                    result, errors = self._validate_row(header, custom_columns, values)
+                    if errors:
+                        error_rows.extend((row_number, field, msg) for field, msg in errors)
+                    else:
+                        valid.append((row_number, *result))
+
+                if valid and self.config_schema is not None:
+                    valid = await self._run_async_validations(session, valid, error_rows)
+
+                if valid:
+                    # ON CONFLICT no modifica la contraseña de usuarios existentes:
+                    # solo se calcula el hash de los emails nuevos
+                    existing = await repository.existing_emails([base.email for _, base, _ in valid])
+                    # bcrypt tarda minutos por lote: no se deja la conexión en
+                    # transacción, y el INSERT corre en una transacción propia cuyo
+                    # now() (creado_en/modificado_en) queda cerca de su commit
+                    await session.commit()
+                    hashed = iter(await _hash_passwords([base.password for _, base, _ in valid if base.email not in existing]))
+                    rows = [
+                        (row_number, base.nombre, base.email, UNUSED_PASSWORD if base.email in existing else next(hashed), json.dumps(custom_data))
+                        for row_number, base, custom_data in valid
+                    ]
+                    affected = await repository.bulk_upsert(self.empresa_id, rows)
+                    for row_number, base, _ in valid:
+                        if base.email not in affected:
+                            error_rows.append((row_number, "email", "El email ya está registrado en otra empresa"))
+                    imported += sum(1 for _, base, _ in valid if base.email in affected)
+
+                failed += len({row[0] for row in error_rows})
+                if error_rows:
+                    error_rows.sort(key=lambda row: row[0])
+                    yield "".join(_csv_line(row) for row in error_rows)
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"Importación CSV empresa {self.empresa_id}: {total_rows} filas, "
+            f"{imported} importadas, {failed} con errores en {elapsed:.1f}s"
+        )
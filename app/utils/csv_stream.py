@@ -0,0 +1,120 @@
+import codecs
+import csv
+from typing import AsyncIterator, List, Optional, Tuple
+
+
+DEFAULT_MAX_RECORD_SIZE = 1024 * 1024
+
+
+class CsvRecordTooLarge(ValueError):
+    """Un registro supera el tamaño máximo (p. ej. comillas sin cerrar)."""
+
+    def __init__(self, row_number: int, max_size: int):
+        super().__init__(f"La fila {row_number} supera {max_size} caracteres (¿comillas sin cerrar?)")
+        self.row_number = row_number
+        self.max_size = max_size
+
+
+def _ends_quoted(line: str, quoted: bool) -> bool:
+    """
+    Si `line` termina dentro de un campo entre comillas, con las reglas de
+    `csv`: una comilla abre el campo solo al inicio de este, `""` es una
+    comilla escapada y en un campo sin comillas (`Monitor 27"`) es literal.
+    `quoted` indica si la línea empieza dentro de un campo entre comillas.
+    """
+    position = 0
+    while True:
+        if quoted:
+            quote = line.find('"', position)
+            if quote == -1:
+                return True
+            if line.startswith('"', quote + 1):
+                position = quote + 2
+                continue
+            quoted = False
+            position = quote + 1
+        elif line.startswith('"', position):
+            quoted = True
+            position += 1
+            continue
+        # Resto del campo sin comillas, hasta el siguiente separador
+        delimiter = line.find(",", position)
+        if delimiter == -1:
+            return False
+        position = delimiter + 1
+
+
+class CsvStreamReader:
+    """
+    Lee un CSV de forma incremental a partir de un iterador asíncrono de bytes
+    (por ejemplo `request.stream()`), sin cargar el archivo completo en memoria.
+    Solo entrega al módulo `csv` registros completos: una línea que abre comillas
+    sin cerrarlas se acumula hasta encontrar el cierre, con un máximo de
+    `max_record_size` caracteres: pasado ese límite se lanza CsvRecordTooLarge,
+    porque después de una comilla desbalanceada no se puede resincronizar.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig", max_record_size: int = DEFAULT_MAX_RECORD_SIZE):
+        self._chunks = chunks
+        self._max_record_size = max_record_size
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._records = self._iter_records()
+        # La fila 1 es el encabezado, igual que en una hoja de cálculo
+        self._row_number = 1
+
+    async def _iter_records(self) -> AsyncIterator[str]:
+        buffer = ""
+        pending = ""
+        yielded = 0
+        async for chunk in self._chunks:
+            buffer += self._decoder.decode(chunk)
+            lines = buffer.split("\n")
+            buffer = lines.pop()
+            for line in lines:
+                quoted = _ends_quoted(line, bool(pending))
+                pending += line + "\n"
+                if not quoted:
+                    yield pending
+                    yielded += 1
+                    pending = ""
+            # También cubre un archivo sin saltos de línea
+            if len(pending) + len(buffer) > self._max_record_size:
+                raise CsvRecordTooLarge(yielded + 1, self._max_record_size)
+
+        pending += buffer + self._decoder.decode(b"", final=True)
+        if pending.strip():
+            yield pending
+
+    async def read_header(self) -> List[str]:
+        async for record in self._records:
+            if record.strip():
+                return [column.strip() for column in next(csv.reader([record]))]
+        return []
+
+    async def batches(self, size: int) -> AsyncIterator[List[Tuple[int, Optional[List[str]]]]]:
+        """
+        Entrega lotes de hasta `size` filas como tuplas (número de fila, valores).
+        Lanza CsvRecordTooLarge después de entregar las filas anteriores al registro.
+        """
+        batch: List[Tuple[int, Optional[List[str]]]] = []
+        try:
+            async for record in self._records:
+                self._row_number += 1
+                if not record.strip():
+                    continue
+                try:
+                    values = next(csv.reader([record], strict=True))
+                except csv.Error:
+                    # Se conserva el registro para que el llamador lo reporte como error
+                    values = None
+                batch.append((self._row_number, values))
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+        except CsvRecordTooLarge:
+            # Las filas completas anteriores al registro inválido se entregan igual
+            if batch:
+                yield batch
+            raise
+        if batch:
+            yield batch
@@ -0,0 +1,21 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(modificado_en: datetime, id: UUID) -> str:
+    """Cursor opaco con la posición (modificado_en, id) del último registro entregado."""
+    raw = json.dumps([modificado_en.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Lanza ValueError si el cursor no es válido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        modificado_en, id = json.loads(raw)
+        return datetime.fromisoformat(modificado_en), UUID(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Cursor inválido") from e
@@ -1,6 +1,9 @@
 from typing import Dict, Any, Type, List, Literal, Annotated, Union, Optional
 from datetime import date as py_date, datetime as py_datetime
-from pydantic import create_model, Field, BaseModel, ValidationError, StringConstraints, EmailStr, HttpUrl
+from pydantic import create_model, Field, BaseModel, ValidationError, AfterValidator, EmailStr, HttpUrl
+from functools import lru_cache
+import json
+from app.utils.safe_regex import PatternCheck
 
 # Mapeo de tipos de texto a tipos de Python básicos
 TYPE_MAPPING = {
@@ -43,8 +46,8 @@ def create_dynamic_model(field_definitions: list) -> Type[BaseModel]:
                 python_type = str
         
         elif field_type == "string" and field.get('regex'):
-            # Usar StringConstraints para validación de regex
-            python_type = Annotated[str, StringConstraints(pattern=field['regex'])]
+            # Regex precompilada, con límite de longitud de entrada y métricas por campo
+            python_type = Annotated[str, AfterValidator(PatternCheck(field_name, field['regex']))]
         
         else:
             # Tipos básicos
@@ -63,17 +66,41 @@ def create_dynamic_model(field_definitions: list) -> Type[BaseModel]:
     # Crea la clase al vuelo
     return create_model('DynamicValidator', **fields_dict)
 
-from app.core.validation_registry import ValidationRegistry
+@lru_cache(maxsize=256)
+def _cached_dynamic_model(fields_json: str) -> Type[BaseModel]:
+    return create_dynamic_model(json.loads(fields_json))
 
-def validate_custom_data(custom_data: Dict[str, Any], config_schema: Dict[str, Any]):
+def get_dynamic_model(field_definitions: list) -> Type[BaseModel]:
+    """create_dynamic_model con caché por contenido: cada configuración se compila una vez."""
+    return _cached_dynamic_model(json.dumps(field_definitions, sort_keys=True, default=str))
+
+from app.core.validation_registry import ValidationRegistry, ValidationContext, validator_timeout
+from app.core.catalogs import catalog_values
+from app.core.settings import settings
+from collections import defaultdict
+import asyncio
+
+def format_validation_errors(e: ValidationError) -> List[Dict[str, Any]]:
+    """Errores de Pydantic sin `ctx` ni `url`, que no son serializables o no aportan al cliente."""
+    errors = []
+    for err in e.errors():
+        err_copy = err.copy()
+        err_copy.pop("ctx", None)
+        err_copy.pop("url", None)
+        errors.append(err_copy)
+    return errors
+
+def validate_custom_data(custom_data: Dict[str, Any], config_schema: Dict[str, Any], dynamic_model: Optional[Type[BaseModel]] = None):
     """
-    Función principal para llamar desde tu servicio
+    Función principal para llamar desde tu servicio.
+    Si se validan muchos registros con la misma configuración, se puede pasar
+    `dynamic_model` (obtenido con `get_dynamic_model`) para no buscarlo en la caché cada vez.
     """
     # 1. Obtenemos la lista de campos de la configuración
     fields_def = config_schema.get('fields', [])
     
     # 2. Creamos el modelo validador específico para tipos y regex
-    DynamicModel = create_dynamic_model(fields_def)
+    DynamicModel = dynamic_model or get_dynamic_model(fields_def)
     
     # 3. Validamos tipos básicos con Pydantic
     try:
@@ -96,6 +123,10 @@ def validate_custom_data(custom_data: Dict[str, Any], config_schema: Dict[str, A
             action = rule.get('action')
             params = rule.get('params', {})
             error_message = rule.get('error_message', "Error de validación")
+
+            # Los validadores asíncronos se ejecutan aparte con run_async_validations
+            if ValidationRegistry.is_async(action):
+                continue
             
             try:
                 is_valid = ValidationRegistry.execute(action, value, **params)
@@ -123,3 +154,98 @@ def validate_custom_data(custom_data: Dict[str, Any], config_schema: Dict[str, A
         )
     
     return validated_data
+
+async def run_async_validations(
+    records: List[Dict[str, Any]],
+    config_schema: Dict[str, Any],
+    context: ValidationContext,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Ejecuta los validadores asíncronos de la configuración sobre `records`,
+    incluida la pertenencia a catálogos de los campos select con `catalog`.
+    Los validadores `batch` reciben en una sola llamada los valores de todos los
+    registros; el resto se llama por valor. Como máximo corren
+    ASYNC_VALIDATION_CONCURRENCY llamadas a la vez y cada una tiene su timeout.
+    Las consultas por `context.session_factory` compartida se ejecutan de a
+    una, así que el límite solo paraleliza lo que no usa esa sesión (p. ej.
+    servicios externos); el timeout no incluye la espera de la sesión.
+    Devuelve los errores agrupados por índice de registro.
+    """
+    semaphore = asyncio.Semaphore(settings.ASYNC_VALIDATION_CONCURRENCY)
+    errors: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+
+    async def run(name: str, rule: Dict[str, Any], indexed: List[tuple], batch: bool):
+        action = rule.get('action')
+        params = rule.get('params', {})
+        options = ValidationRegistry.get_async_options(action)
+        timeout = options["timeout"] or settings.ASYNC_VALIDATION_TIMEOUT
+        validator = ValidationRegistry.get_validator(action)
+
+        async with semaphore:
+            try:
+                async with asyncio.timeout(timeout) as deadline:
+                    # Cada llamada corre en su propia tarea (gather): el valor no se filtra a otras
+                    validator_timeout.set((deadline, timeout))
+                    if batch:
+                        results = await validator([value for _, value in indexed], field=name, context=context, **params)
+                    else:
+                        results = [await validator(indexed[0][1], field=name, context=context, **params)]
+                # Con menos resultados, los valores sobrantes pasarían como válidos
+                if len(results) != len(indexed):
+                    raise ValueError(f"devolvió {len(results)} resultados para {len(indexed)} valores")
+                messages = [None if ok else rule.get('error_message', "Error de validación") for ok in results]
+            except asyncio.TimeoutError:
+                messages = [f"La validación {action} excedió el tiempo límite"] * len(indexed)
+            except Exception as e:
+                messages = [f"Error ejecutando validación {action}: {str(e)}"] * len(indexed)
+
+        for (index, _), message in zip(indexed, messages, strict=True):
+            if message:
+                errors[index].append({
+                    "loc": ["custom_data", name],
+                    "msg": message,
+                    "type": "value_error",
+                })
+
+    async def check_catalog(name: str, catalog: str, indexed: List[tuple]):
+        # Una consulta de versión por lote; la pertenencia se resuelve en memoria
+        async with semaphore:
+            try:
+                async with context.session_factory() as session:
+                    values = await catalog_values.get(session, context.empresa_id, catalog)
+                if values is None:
+                    messages = [f"El catálogo {catalog} no existe"] * len(indexed)
+                else:
+                    messages = [None if value in values else f"El valor no pertenece al catálogo {catalog}" for _, value in indexed]
+            except Exception as e:
+                messages = [f"Error consultando el catálogo {catalog}: {str(e)}"] * len(indexed)
+
+        for (index, _), message in zip(indexed, messages, strict=True):
+            if message:
+                errors[index].append({
+                    "loc": ["custom_data", name],
+                    "msg": message,
+                    "type": "value_error",
+                })
+
+    calls = []
+    for field in config_schema.get('fields', []):
+        name = field.get('name')
+        if field.get('catalog'):
+            indexed = [(i, record.get(name)) for i, record in enumerate(records) if record.get(name) is not None]
+            if indexed:
+                calls.append(check_catalog(name, field['catalog'], indexed))
+        for rule in field.get('validations') or []:
+            action = rule.get('action')
+            if not ValidationRegistry.is_async(action):
+                continue
+            indexed = [(i, record.get(name)) for i, record in enumerate(records) if record.get(name) is not None]
+            if not indexed:
+                continue
+            if ValidationRegistry.get_async_options(action)["batch"]:
+                calls.append(run(name, rule, indexed, batch=True))
+            else:
+                calls.extend(run(name, rule, [item], batch=False) for item in indexed)
+
+    await asyncio.gather(*calls)
+    return dict(errors)
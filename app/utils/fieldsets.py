@@ -0,0 +1,106 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Type
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+CUSTOM_DATA = "custom_data"
+
+
+class FieldSelection(NamedTuple):
+    """Columnas pedidas con `fields=` y claves individuales de custom_data."""
+    columns: tuple
+    custom_keys: tuple
+
+    @property
+    def names(self) -> frozenset:
+        names = set(self.columns)
+        if self.custom_keys:
+            names.add(CUSTOM_DATA)
+        return frozenset(names)
+
+
+def parse_fields(fields: str, allowed: Iterable[str]) -> FieldSelection:
+    """
+    Interpreta `fields=nombre,email,custom_data.talla_camisa`.
+    El `id` se incluye siempre. Lanza ValueError ante campos desconocidos.
+    """
+    allowed = set(allowed)
+    columns = ["id"]
+    custom_keys = []
+    for raw in fields.split(","):
+        name = raw.strip()
+        if not name:
+            continue
+        if name.startswith(f"{CUSTOM_DATA}."):
+            key = name[len(CUSTOM_DATA) + 1:]
+            if not key or CUSTOM_DATA not in allowed:
+                raise ValueError(f"Campo inválido: {name}")
+            if key not in custom_keys:
+                custom_keys.append(key)
+        elif name in allowed:
+            if name not in columns:
+                columns.append(name)
+        else:
+            raise ValueError(f"Campo desconocido: {name}")
+
+    # Si se pide custom_data completo no tiene sentido extraer claves sueltas
+    if CUSTOM_DATA in columns:
+        custom_keys = []
+    return FieldSelection(tuple(columns), tuple(custom_keys))
+
+
+def parse_fields_param(fields: str, schema: Type[BaseModel]) -> FieldSelection:
+    """parse_fields contra los campos públicos del schema de respuesta, con error 400."""
+    try:
+        return parse_fields(fields, schema.model_fields.keys())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def select_columns(model, selection: FieldSelection) -> list:
+    """Expresiones para `select(...)`; las claves de custom_data se resuelven con `->`."""
+    custom_data = getattr(model, CUSTOM_DATA, None)
+    return (
+        [getattr(model, name) for name in selection.columns]
+        + [custom_data[key] for key in selection.custom_keys]
+    )
+
+
+def row_to_dict(row: Sequence[Any], selection: FieldSelection) -> Dict[str, Any]:
+    data = dict(zip(selection.columns, row))
+    if selection.custom_keys:
+        values = row[len(selection.columns):]
+        data[CUSTOM_DATA] = {
+            key: value
+            for key, value in zip(selection.custom_keys, values)
+            if value is not None
+        }
+    return data
+
+
+@lru_cache(maxsize=256)
+def _partial_adapter(schema: Type[BaseModel], names: frozenset, many: bool) -> TypeAdapter:
+    partial = create_model(
+        f"{schema.__name__}Parcial",
+        **{
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if name in names
+        }
+    )
+    return TypeAdapter(List[partial] if many else partial)
+
+
+def render_json(schema: Type[BaseModel], selection: FieldSelection, data: Any, many: bool = True) -> bytes:
+    """Serializa a JSON con un modelo reducido a los campos pedidos."""
+    adapter = _partial_adapter(schema, selection.names, many)
+    return adapter.dump_json(adapter.validate_python(data))
+
+
+def render(schema: Type[BaseModel], selection: FieldSelection, data: Any, many: bool = True) -> Response:
+    """render_json como respuesta HTTP."""
+    return Response(
+        content=render_json(schema, selection, data, many),
+        media_type="application/json"
+    )
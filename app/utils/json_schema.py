@@ -0,0 +1,129 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.settings import settings
+
+JSON_SCHEMA_DIALECT = "https://json-schema.org/draft/2020-12/schema"
+
+BASE_TYPES: Dict[str, Dict[str, Any]] = {
+    "string": {"type": "string"},
+    "integer": {"type": "integer"},
+    "float": {"type": "number"},
+    "boolean": {"type": "boolean"},
+    "date": {"type": "string", "format": "date"},
+    "datetime": {"type": "string", "format": "date-time"},
+    "email": {"type": "string", "format": "email"},
+    "phone": {"type": "string"},
+    "url": {"type": "string", "format": "uri"},
+}
+
+NUMERIC_KEYWORDS = {
+    "gt": "exclusiveMinimum",
+    "gte": "minimum",
+    "lt": "exclusiveMaximum",
+    "lte": "maximum",
+}
+
+# formatMinimum/formatMaximum: vocabulario de ajv-formats para comparar fechas
+DATE_KEYWORDS = {
+    "gt": "formatExclusiveMinimum",
+    "gte": "formatMinimum",
+    "lt": "formatExclusiveMaximum",
+    "lte": "formatMaximum",
+}
+
+
+def _numeric_rule(params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        threshold = float(params["threshold"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if threshold.is_integer():
+        threshold = int(threshold)
+    operator = params.get("operator")
+    if operator in NUMERIC_KEYWORDS:
+        return {NUMERIC_KEYWORDS[operator]: threshold}
+    if operator == "eq":
+        return {"const": threshold}
+    if operator == "neq":
+        return {"not": {"const": threshold}}
+    return None
+
+
+def _date_rule(params: Dict[str, Any], field_type: str) -> Optional[Dict[str, Any]]:
+    # "now"/"today" cambian cada día: no caben en un schema que se cachea indefinidamente
+    reference = params.get("reference_date")
+    operator = params.get("operator")
+    if operator not in DATE_KEYWORDS or reference in (None, "now", "today"):
+        return None
+    try:
+        reference_date = datetime.fromisoformat(reference).date()
+    except (TypeError, ValueError):
+        return None
+    # El servidor compara solo la fecha, también en campos datetime
+    if field_type == "datetime":
+        return None
+    return {DATE_KEYWORDS[operator]: reference_date.isoformat()}
+
+
+def _field_schema(field: Dict[str, Any]) -> Dict[str, Any]:
+    field_type = field["type"]
+    if field_type == "select" and field.get("options"):
+        schema: Dict[str, Any] = {
+            "oneOf": [{"const": option["value"], "title": option["label"]} for option in field["options"]]
+        }
+    elif field_type == "select" and field.get("catalog"):
+        # Opciones paginadas en /catalogos/{id}/options; el servidor valida la pertenencia
+        schema = {"type": "string", "x-catalog": field["catalog"]}
+    else:
+        schema = dict(BASE_TYPES.get(field_type, {"type": "string"}))
+        if field_type == "string" and field.get("regex"):
+            schema["pattern"] = field["regex"]
+            schema["maxLength"] = settings.REGEX_MAX_INPUT_LENGTH
+
+    server_only: List[Dict[str, Any]] = []
+    for rule in field.get("validations") or []:
+        action = rule.get("action")
+        params = rule.get("params") or {}
+        if action == "numeric_comparation":
+            keywords = _numeric_rule(params)
+        elif action == "date_comparation":
+            keywords = _date_rule(params, field_type)
+        else:
+            keywords = None
+        if keywords and not set(keywords) & set(schema):
+            schema.update(keywords)
+        else:
+            server_only.append({"action": action, "params": params})
+    if not field.get("required"):
+        # Igual que el modelo dinámico: los campos opcionales aceptan null
+        schema = {"anyOf": [schema, {"type": "null"}]}
+    schema["title"] = field.get("label", field["name"])
+    if server_only:
+        # El cliente no puede evaluarlas; solo sabe que el servidor las aplicará
+        schema["x-server-validations"] = server_only
+    return schema
+
+
+def config_to_json_schema(config_schema: Dict[str, Any], title: str) -> Dict[str, Any]:
+    """
+    Traduce un ConfigSchema a JSON Schema (draft 2020-12) para validar
+    custom_data en el cliente. Las reglas que JSON Schema no puede expresar
+    quedan listadas en `x-server-validations` del campo.
+    """
+    fields = config_schema.get("fields", [])
+    return {
+        "$schema": JSON_SCHEMA_DIALECT,
+        "title": title,
+        "type": "object",
+        "properties": {field["name"]: _field_schema(field) for field in fields},
+        "required": [field["name"] for field in fields if field.get("required")],
+    }
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Hash estable del contenido, independiente del orden de las claves."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
@@ -0,0 +1,147 @@
+import logging
+import re
+import re._constants as sre_constants
+import re._parser as sre_parse
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from pydantic_core import PydanticCustomError, SchemaError, SchemaValidator, ValidationError, core_schema
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+
+def _subpatterns(op, av) -> List[Any]:
+    if op in _REPEATS:
+        return [av[2]]
+    if op is sre_constants.SUBPATTERN:
+        return [av[3]]
+    if op is sre_constants.BRANCH:
+        return list(av[1])
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [av[1]]
+    if op is sre_constants.ATOMIC_GROUP:
+        return [av]
+    return []
+
+
+def _has_unbounded_repeat(parsed) -> bool:
+    for op, av in parsed:
+        if op in _REPEATS and av[1] == sre_constants.MAXREPEAT:
+            return True
+        if any(_has_unbounded_repeat(sub) for sub in _subpatterns(op, av)):
+            return True
+    return False
+
+
+def _has_nested_quantifier(parsed) -> bool:
+    """`(a+)+`, `(\\w*x?)*`...: un cuantificador sin límite dentro de otro."""
+    for op, av in parsed:
+        if op in _REPEATS and av[1] == sre_constants.MAXREPEAT and _has_unbounded_repeat(av[2]):
+            return True
+        if any(_has_nested_quantifier(sub) for sub in _subpatterns(op, av)):
+            return True
+    return False
+
+
+def find_pattern_problems(pattern: str) -> List[str]:
+    """
+    Motivos para rechazar una regex de FieldDefinition. La validación del
+    servidor usa el motor de pydantic-core (tiempo lineal), pero la misma regex
+    se publica en el JSON Schema y los motores con backtracking del cliente
+    pueden tardar un tiempo exponencial con cuantificadores anidados.
+    """
+    if len(pattern) > settings.REGEX_MAX_PATTERN_LENGTH:
+        return [f"La regex supera {settings.REGEX_MAX_PATTERN_LENGTH} caracteres"]
+    try:
+        _matcher(pattern)
+    except SchemaError:
+        return ["La regex no es válida o usa características no soportadas (lookaround, referencias)"]
+
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        # Sintaxis válida solo para el motor de pydantic-core (p. ej. \p{L})
+        return []
+    if _has_nested_quantifier(parsed):
+        return ["La regex tiene cuantificadores anidados con backtracking exponencial (p. ej. (a+)+)"]
+    return []
+
+
+@lru_cache(maxsize=1024)
+def _matcher(pattern: str) -> SchemaValidator:
+    """Validador compilado una sola vez por regex (en todo el proceso)."""
+    return SchemaValidator(core_schema.str_schema(pattern=pattern, max_length=settings.REGEX_MAX_INPUT_LENGTH))
+
+
+class RegexMetrics:
+    """Tiempo de evaluación de regex por campo, acumulado en memoria (por worker)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fields: Dict[str, Dict[str, float]] = {}
+
+    def record(self, field: str, elapsed_ms: float):
+        with self._lock:
+            stats = self._fields.setdefault(field, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "slow": 0})
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            if elapsed_ms >= settings.REGEX_SLOW_MATCH_MS:
+                stats["slow"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                field: {
+                    **stats,
+                    "total_ms": round(stats["total_ms"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 4) if stats["count"] else 0.0,
+                }
+                for field, stats in self._fields.items()
+            }
+
+
+regex_metrics = RegexMetrics()
+
+
+class PatternCheck:
+    """
+    AfterValidator para campos con regex. La entrada se limita a
+    REGEX_MAX_INPUT_LENGTH caracteres: con un motor lineal eso acota el costo
+    de cada evaluación, que además se mide por campo.
+    """
+
+    def __init__(self, field: str, pattern: str):
+        self.field = field
+        self.pattern = pattern
+        self.matcher = _matcher(pattern)
+
+    def __call__(self, value: str) -> str:
+        start = time.perf_counter()
+        try:
+            self.matcher.validate_python(value)
+        except ValidationError as e:
+            if e.errors()[0]["type"] == "string_too_long":
+                raise PydanticCustomError(
+                    "string_too_long",
+                    "String should have at most {max_length} characters",
+                    {"max_length": settings.REGEX_MAX_INPUT_LENGTH},
+                )
+            raise PydanticCustomError(
+                "string_pattern_mismatch",
+                "String should match pattern '{pattern}'",
+                {"pattern": self.pattern},
+            )
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            regex_metrics.record(self.field, elapsed_ms)
+            if elapsed_ms >= settings.REGEX_SLOW_MATCH_MS:
+                logger.warning(f"Regex lenta en el campo {self.field}: {elapsed_ms:.1f}ms")
+        return value
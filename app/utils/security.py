@@ -1,12 +1,96 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
 import bcrypt
+from fastapi import HTTPException
+
+from app.core.settings import settings
+
+# bcrypt es CPU puro: un pool acotado y propio evita que una ráfaga de logins
+# ocupe el executor por defecto que usa el resto de la aplicación
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+_dummy_hash: Optional[str] = None
+
+BUSY_RETRY_SECONDS = 0.05
+
+
+class PasswordPoolBusy(Exception):
+    """Hay demasiadas verificaciones de contraseña en cola."""
+
 
 def hash_password(password: str) -> str:
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 def verify_password(password: str, hashed_password: str) -> bool:
     password_bytes = password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
\ No newline at end of file
+    try:
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
+    except ValueError:
+        # Contraseña de más de 72 bytes o hash con formato inválido
+        return False
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True si el hash se calculó con un costo distinto a BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+async def run_in_password_pool(func, *args):
+    """Ejecuta `func` en el pool de bcrypt; lanza PasswordPoolBusy si la cola está llena."""
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordPoolBusy()
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _pending -= 1
+
+def password_pool_busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Servidor ocupado, reintente en unos segundos",
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+    )
+
+async def hash_password_pooled(password: str) -> str:
+    """hash_password en el pool de bcrypt; 503 si la cola está llena."""
+    try:
+        return await run_in_password_pool(hash_password, password)
+    except PasswordPoolBusy:
+        raise password_pool_busy_error()
+
+async def hash_passwords_pooled(passwords: List[str]) -> List[str]:
+    """
+    Para lotes (importación CSV): usa a lo sumo la mitad de los hilos del pool
+    para dejar lugar a los logins y, si la cola está llena, espera en lugar de fallar.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.PASSWORD_HASH_WORKERS // 2))
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            while True:
+                try:
+                    return await run_in_password_pool(hash_password, password)
+                except PasswordPoolBusy:
+                    await asyncio.sleep(BUSY_RETRY_SECONDS)
+
+    return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+async def dummy_hash() -> str:
+    """
+    Hash contra el que se verifica cuando el email no existe, para que el tiempo
+    de respuesta no revele qué cuentas están registradas. Se calcula en el pool
+    (al arrancar, desde el lifespan) y no en el event loop.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await run_in_password_pool(hash_password, "usuario-inexistente")
+    return _dummy_hash
@@ -0,0 +1,73 @@
+"""
+Helpers para migraciones que crean índices sin bloquear escrituras.
+
+`CREATE INDEX CONCURRENTLY` no puede ejecutarse dentro de una transacción, por
+eso cada operación corre en un `autocommit_block()`. Si la creación falla
+(deadlock, cancelación, violación de unicidad) Postgres deja un índice
+inválido con ese nombre: se elimina y se reintenta.
+"""
+import logging
+import time
+from typing import Optional, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+DEFAULT_RETRIES = 3
+RETRY_DELAY_SECONDS = 5
+
+
+def _index_state(name: str) -> Optional[bool]:
+    """True si el índice existe y es válido, False si quedó inválido, None si no existe."""
+    return op.get_bind().execute(
+        sa.text("""
+            SELECT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND pg_catalog.pg_table_is_visible(c.oid)
+        """),
+        {"name": name},
+    ).scalar_one_or_none()
+
+
+def _drop_invalid(name: str):
+    # Un índice inválido no se usa en consultas pero sí se mantiene en cada escritura
+    if _index_state(name) is False:
+        logger.warning(f"Eliminando índice inválido {name}")
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence,
+    retries: int = DEFAULT_RETRIES,
+    **kw,
+) -> None:
+    """`op.create_index(...)` con CONCURRENTLY, idempotente y con reintentos."""
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            # Modo offline (--sql): no hay conexión para inspeccionar ni reintentar
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+            return
+        for attempt in range(1, retries + 1):
+            _drop_invalid(name)
+            if _index_state(name):
+                return
+            try:
+                op.create_index(name, table, columns, postgresql_concurrently=True, **kw)
+                return
+            except DBAPIError as e:
+                logger.warning(f"Falló la creación de {name} (intento {attempt}/{retries}): {e.orig}")
+                _drop_invalid(name)
+                if attempt == retries:
+                    raise
+                time.sleep(RETRY_DELAY_SECONDS)
+
+
+def drop_index_concurrently(name: str, table: str, **kw) -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True, **kw)
@@ -0,0 +1,36 @@
+"""Add partial index on active usuarios
+
+Revision ID: 3f2a9c1d7b64
+Revises: 01447aefd7ff
+Create Date: 2026-10-19 10:12:41.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b64'
+down_revision: Union[str, Sequence[str], None] = '01447aefd7ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_concurrently(
+        'ix_usuarios_activos_empresa_creado',
+        'usuarios',
+        ['empresa_id', 'creado_en'],
+        unique=False,
+        postgresql_where=sa.text('estado = 1'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_usuarios_activos_empresa_creado', 'usuarios')
@@ -0,0 +1,56 @@
+"""Add catalogs and catalog_options tables
+
+Revision ID: 4b7d19e6c3a8
+Revises: c5e8d2f4a913
+Create Date: 2026-10-19 14:26:53.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7d19e6c3a8'
+down_revision: Union[str, Sequence[str], None] = 'c5e8d2f4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('catalogs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('empresa_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('modificado_en', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['empresa_id'], ['empresas.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('empresa_id', 'name', name='uq_catalog_empresa_name')
+    )
+    op.create_table('catalog_options',
+    sa.Column('catalog_id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('label', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['catalog_id'], ['catalogs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('catalog_id', 'value')
+    )
+    op.create_index('ix_catalog_options_catalog_label', 'catalog_options', ['catalog_id', 'label'], unique=False)
+    op.create_index(
+        'ix_catalog_options_label_trgm',
+        'catalog_options',
+        ['label'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'label': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_catalog_options_label_trgm', table_name='catalog_options', postgresql_using='gin')
+    op.drop_index('ix_catalog_options_catalog_label', table_name='catalog_options')
+    op.drop_table('catalog_options')
+    op.drop_table('catalogs')
@@ -0,0 +1,29 @@
+"""Add entity config event sequence
+
+Revision ID: 5b8e1f3c7a20
+Revises: 7a4c2e9b5d13
+Create Date: 2026-10-19 19:12:44.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1f3c7a20'
+down_revision: Union[str, Sequence[str], None] = '7a4c2e9b5d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Ids de los eventos SSE, compartidos por todos los workers
+    op.execute('CREATE SEQUENCE IF NOT EXISTS entity_config_event_seq')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP SEQUENCE IF EXISTS entity_config_event_seq')
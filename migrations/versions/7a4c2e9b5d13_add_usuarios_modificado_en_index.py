@@ -0,0 +1,35 @@
+"""Add usuarios modificado_en index for email filter refresh
+
+Revision ID: 7a4c2e9b5d13
+Revises: d61a3f9c2e84
+Create Date: 2026-10-19 17:58:21.340917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4c2e9b5d13'
+down_revision: Union[str, Sequence[str], None] = 'd61a3f9c2e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_concurrently(
+        'ix_usuarios_modificado_en',
+        'usuarios',
+        ['modificado_en'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_usuarios_modificado_en', 'usuarios')
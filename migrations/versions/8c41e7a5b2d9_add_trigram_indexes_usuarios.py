@@ -0,0 +1,47 @@
+"""Add pg_trgm indexes on usuarios nombre and email
+
+Revision ID: 8c41e7a5b2d9
+Revises: 3f2a9c1d7b64
+Create Date: 2026-10-19 11:03:27.582190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e7a5b2d9'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    create_index_concurrently(
+        'ix_usuarios_nombre_trgm',
+        'usuarios',
+        ['nombre'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'nombre': 'gin_trgm_ops'},
+    )
+    create_index_concurrently(
+        'ix_usuarios_email_trgm',
+        'usuarios',
+        ['email'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'email': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_usuarios_email_trgm', 'usuarios')
+    drop_index_concurrently('ix_usuarios_nombre_trgm', 'usuarios')
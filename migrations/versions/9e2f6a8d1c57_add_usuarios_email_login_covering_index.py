@@ -0,0 +1,36 @@
+"""Add covering index for usuarios login lookup
+
+Revision ID: 9e2f6a8d1c57
+Revises: 4b7d19e6c3a8
+Create Date: 2026-10-19 15:38:12.904713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2f6a8d1c57'
+down_revision: Union[str, Sequence[str], None] = '4b7d19e6c3a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_concurrently(
+        'ix_usuarios_email_login',
+        'usuarios',
+        ['email'],
+        unique=False,
+        postgresql_include=['id', 'password', 'estado'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_usuarios_email_login', 'usuarios')
@@ -0,0 +1,51 @@
+"""Add usuarios change feed index and modificado_en trigger
+
+Revision ID: c5e8d2f4a913
+Revises: 8c41e7a5b2d9
+Create Date: 2026-10-19 11:47:09.661402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8d2f4a913'
+down_revision: Union[str, Sequence[str], None] = '8c41e7a5b2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_concurrently(
+        'ix_usuarios_empresa_modificado_id',
+        'usuarios',
+        ['empresa_id', 'modificado_en', 'id'],
+        unique=False,
+    )
+    # El onupdate del ORM no cubre UPDATE masivos ni SQL directo
+    op.execute("""
+        CREATE OR REPLACE FUNCTION usuarios_set_modificado_en() RETURNS trigger AS $$
+        BEGIN
+            NEW.modificado_en = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_usuarios_modificado_en
+        BEFORE UPDATE ON usuarios
+        FOR EACH ROW EXECUTE FUNCTION usuarios_set_modificado_en()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS trg_usuarios_modificado_en ON usuarios')
+    op.execute('DROP FUNCTION IF EXISTS usuarios_set_modificado_en()')
+    drop_index_concurrently('ix_usuarios_empresa_modificado_id', 'usuarios')
@@ -0,0 +1,46 @@
+"""Add id to ix_usuarios_activos_empresa_creado as ordering tiebreaker
+
+Revision ID: d61a3f9c2e84
+Revises: 9e2f6a8d1c57
+Create Date: 2026-10-19 17:12:40.561203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd61a3f9c2e84'
+down_revision: Union[str, Sequence[str], None] = '9e2f6a8d1c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_usuarios_activos_empresa_creado'
+TEMP_INDEX = f'{INDEX}_tmp'
+
+
+def _replace_index(columns) -> None:
+    # Se crea el nuevo con otro nombre y se renombra, para no quedar sin índice en el medio
+    create_index_concurrently(
+        TEMP_INDEX,
+        'usuarios',
+        columns,
+        unique=False,
+        postgresql_where=sa.text('estado = 1'),
+    )
+    drop_index_concurrently(INDEX, 'usuarios')
+    op.execute(f'ALTER INDEX "{TEMP_INDEX}" RENAME TO "{INDEX}"')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_index(['empresa_id', 'creado_en', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_index(['empresa_id', 'creado_en'])
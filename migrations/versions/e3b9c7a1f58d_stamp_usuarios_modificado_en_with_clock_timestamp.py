@@ -0,0 +1,57 @@
+"""Stamp usuarios modificado_en with clock_timestamp
+
+Revision ID: e3b9c7a1f58d
+Revises: 5b8e1f3c7a20
+Create Date: 2026-10-19 19:48:03.225716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9c7a1f58d'
+down_revision: Union[str, Sequence[str], None] = '5b8e1f3c7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() es el inicio de la transacción: en una escritura larga la fila quedaría
+    # con una fecha anterior a la que el feed de cambios ya dejó atrás
+    op.execute("""
+        CREATE OR REPLACE FUNCTION usuarios_set_modificado_en() RETURNS trigger AS $$
+        BEGIN
+            NEW.modificado_en = clock_timestamp();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # También las altas, que de otro modo toman el default now()
+    op.execute('DROP TRIGGER IF EXISTS trg_usuarios_modificado_en ON usuarios')
+    op.execute("""
+        CREATE TRIGGER trg_usuarios_modificado_en
+        BEFORE INSERT OR UPDATE ON usuarios
+        FOR EACH ROW EXECUTE FUNCTION usuarios_set_modificado_en()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS trg_usuarios_modificado_en ON usuarios')
+    op.execute("""
+        CREATE OR REPLACE FUNCTION usuarios_set_modificado_en() RETURNS trigger AS $$
+        BEGIN
+            NEW.modificado_en = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_usuarios_modificado_en
+        BEFORE UPDATE ON usuarios
+        FOR EACH ROW EXECUTE FUNCTION usuarios_set_modificado_en()
+    """)
@@ -0,0 +1,265 @@
+"""
+Backfill de custom_data después de un cambio de EntityConfig.
+
+Compara la configuración anterior (archivo JSON con el `config` viejo) con la
+vigente en la base y aplica a los usuarios de la empresa, en lotes ordenados
+por id y con transacciones cortas:
+
+- valores por defecto para campos nuevos u obligatorios que no existen (--default),
+- renombres de claves (--rename viejo=nuevo),
+- conversión de valores de campos que cambiaron de tipo,
+- eliminación de claves de campos que ya no existen (--drop-removed).
+
+El progreso se guarda en un checkpoint después de cada lote; si el proceso se
+interrumpe, al volver a ejecutarlo con los mismos argumentos continúa desde ahí.
+
+Uso (desde la raíz del repositorio):
+
+    uv run python -m scripts.backfill_custom_data --empresa-id <uuid> \\
+        --old-config config_anterior.json --default talla_camisa='"M"' --dry-run
+"""
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select, text, update
+
+from app.core.db import get_sync_db
+from app.models.entity_config import EntityConfig
+from app.models.usuario import Usuario
+from app.utils.dynamic_validator import TYPE_MAPPING
+
+ENTITY_MODELS = {"usuario": Usuario}
+
+
+def parse_assignments(values: List[str], parse_json: bool) -> Dict[str, Any]:
+    result = {}
+    for item in values:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise SystemExit(f"Formato inválido '{item}', se esperaba clave=valor")
+        if parse_json:
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                pass
+        result[key] = value
+    return result
+
+
+def build_plan(old_config: Optional[Dict[str, Any]], new_config: Dict[str, Any], defaults: Dict[str, Any],
+               renames: Dict[str, str], drop_removed: bool) -> Dict[str, Any]:
+    """Diferencia entre configuraciones traducida a operaciones sobre custom_data."""
+    new_fields = {f["name"]: f for f in new_config.get("fields", [])}
+    old_fields = {f["name"]: f for f in (old_config or {}).get("fields", [])}
+
+    unknown = [name for name in defaults if name not in new_fields]
+    unknown += [new for new in renames.values() if new not in new_fields]
+    if unknown:
+        raise SystemExit(f"Campos que no existen en la configuración vigente: {', '.join(unknown)}")
+
+    added = [name for name in new_fields if name not in old_fields and name not in renames.values()]
+    newly_required = [
+        name for name, field in new_fields.items()
+        if field.get("required") and not old_fields.get(name, {}).get("required")
+    ]
+    missing_defaults = [name for name in newly_required if name not in defaults]
+    if missing_defaults:
+        print(f"Aviso: campos obligatorios sin --default: {', '.join(missing_defaults)}", file=sys.stderr)
+
+    retyped = {
+        name: field["type"]
+        for name, field in new_fields.items()
+        if name in old_fields and old_fields[name]["type"] != field["type"]
+    }
+    removed = [
+        name for name in old_fields
+        if name not in new_fields and name not in renames
+    ] if drop_removed else []
+
+    return {
+        "added": added,
+        "defaults": defaults,
+        "renames": renames,
+        "retyped": retyped,
+        "removed": removed,
+    }
+
+
+def transform(custom_data: Dict[str, Any], plan: Dict[str, Any], adapters: Dict[str, TypeAdapter]) -> Tuple[Dict[str, Any], bool]:
+    """Aplica el plan a un registro. Devuelve (nuevo custom_data, hubo error de conversión)."""
+    data = dict(custom_data or {})
+    failed = False
+
+    for old, new in plan["renames"].items():
+        if old in data and new not in data:
+            data[new] = data.pop(old)
+
+    for name in plan["removed"]:
+        data.pop(name, None)
+
+    for name, adapter in adapters.items():
+        if data.get(name) is None:
+            continue
+        try:
+            data[name] = adapter.dump_python(adapter.validate_python(data[name]), mode="json")
+        except ValidationError:
+            failed = True
+
+    for name, value in plan["defaults"].items():
+        if data.get(name) is None:
+            data[name] = value
+
+    return data, failed
+
+
+class Checkpoint:
+    def __init__(self, path: Path, plan_hash: str):
+        self.path = path
+        self.plan_hash = plan_hash
+        self.last_id: Optional[str] = None
+        self.processed = 0
+        self.updated = 0
+        self.failed = 0
+
+    def load(self):
+        if not self.path.exists():
+            return
+        state = json.loads(self.path.read_text())
+        if state.get("plan_hash") != self.plan_hash:
+            raise SystemExit(
+                f"El checkpoint {self.path} corresponde a otro plan; bórrelo o use --checkpoint distinto"
+            )
+        self.last_id = state["last_id"]
+        self.processed = state["processed"]
+        self.updated = state["updated"]
+        self.failed = state["failed"]
+        print(f"Reanudando desde id {self.last_id} ({self.processed} filas ya procesadas)")
+
+    def save(self):
+        state = {
+            "plan_hash": self.plan_hash,
+            "last_id": self.last_id,
+            "processed": self.processed,
+            "updated": self.updated,
+            "failed": self.failed,
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        tmp.replace(self.path)
+
+
+def run(args: argparse.Namespace):
+    model = ENTITY_MODELS.get(args.entity_type)
+    if model is None:
+        raise SystemExit(f"Tipo de entidad no soportado: {args.entity_type}")
+
+    old_config = json.loads(Path(args.old_config).read_text()) if args.old_config else None
+    if old_config and "config" in old_config:
+        old_config = old_config["config"]
+
+    db = get_sync_db()
+    session = next(db)
+    try:
+        entity_config = session.execute(
+            select(EntityConfig).where(
+                EntityConfig.empresa_id == args.empresa_id,
+                EntityConfig.entity_type == args.entity_type,
+            )
+        ).scalar_one_or_none()
+        if entity_config is None:
+            raise SystemExit("No existe configuración para esa empresa y tipo de entidad")
+        new_config = entity_config.config
+        session.rollback()
+
+        plan = build_plan(
+            old_config,
+            new_config,
+            parse_assignments(args.default, parse_json=True),
+            parse_assignments(args.rename, parse_json=False),
+            args.drop_removed,
+        )
+        print("Plan:", json.dumps(plan, ensure_ascii=False, default=str))
+        adapters = {name: TypeAdapter(TYPE_MAPPING.get(type_, str)) for name, type_ in plan["retyped"].items()}
+
+        plan_hash = hashlib.sha256(
+            json.dumps([args.empresa_id, args.entity_type, plan], sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        checkpoint_path = Path(args.checkpoint or f".backfill_{args.empresa_id}_{args.entity_type}.json")
+        checkpoint = Checkpoint(checkpoint_path, plan_hash)
+        checkpoint.load()
+
+        started = time.monotonic()
+        processed_at_start = checkpoint.processed
+        while True:
+            # Transacción corta por lote: FOR UPDATE evita pisar ediciones concurrentes
+            if not args.dry_run:
+                session.execute(text("SELECT set_config('lock_timeout', :value, true)"), {"value": args.lock_timeout})
+            query = select(model.id, model.custom_data).where(model.empresa_id == args.empresa_id)
+            if checkpoint.last_id:
+                query = query.where(model.id > checkpoint.last_id)
+            query = query.order_by(model.id).limit(args.batch_size)
+            if not args.dry_run:
+                query = query.with_for_update()
+            rows = session.execute(query).all()
+            if not rows:
+                session.rollback()
+                break
+
+            changes = []
+            for row in rows:
+                new_data, failed = transform(row.custom_data, plan, adapters)
+                checkpoint.failed += failed
+                if new_data != row.custom_data:
+                    changes.append({"id": row.id, "custom_data": new_data})
+
+            if changes and not args.dry_run:
+                session.execute(update(model), changes)
+            if args.dry_run:
+                session.rollback()
+            else:
+                session.commit()
+
+            checkpoint.last_id = str(rows[-1].id)
+            checkpoint.processed += len(rows)
+            checkpoint.updated += len(changes)
+            if not args.dry_run:
+                checkpoint.save()
+
+            elapsed = time.monotonic() - started
+            rate = (checkpoint.processed - processed_at_start) / elapsed if elapsed else 0
+            print(f"{checkpoint.processed} filas procesadas, {checkpoint.updated} modificadas, "
+                  f"{checkpoint.failed} sin convertir, {rate:.0f} filas/s")
+            if args.sleep:
+                time.sleep(args.sleep)
+
+        elapsed = time.monotonic() - started
+        print(f"Terminado en {elapsed:.1f}s{' (simulación, sin cambios)' if args.dry_run else ''}")
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Backfill de custom_data tras cambiar una EntityConfig")
+    parser.add_argument("--empresa-id", required=True)
+    parser.add_argument("--entity-type", default="usuario")
+    parser.add_argument("--old-config", help="JSON con la configuración anterior (ConfigSchema o EntityConfig)")
+    parser.add_argument("--default", action="append", default=[], metavar="CAMPO=JSON",
+                        help="Valor por defecto para registros sin el campo (valor JSON o texto)")
+    parser.add_argument("--rename", action="append", default=[], metavar="VIEJO=NUEVO")
+    parser.add_argument("--drop-removed", action="store_true", help="Eliminar claves de campos que ya no existen")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--lock-timeout", default="5s")
+    parser.add_argument("--sleep", type=float, default=0, help="Pausa entre lotes en segundos")
+    parser.add_argument("--checkpoint", help="Ruta del archivo de checkpoint")
+    parser.add_argument("--dry-run", action="store_true")
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
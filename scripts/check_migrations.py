@@ -0,0 +1,109 @@
+"""
+Revisa las migraciones en busca de índices que bloquean escrituras.
+
+Un `op.create_index(...)` o un `CREATE INDEX` en `op.execute(...)` sin
+CONCURRENTLY toma un lock SHARE sobre la tabla mientras se construye el
+índice. Sobre tablas grandes eso bloquea los INSERT/UPDATE por minutos; se debe
+usar `create_index_concurrently` de `migrations.helpers`.
+
+Los índices sobre tablas creadas en la misma migración no se reportan (la
+tabla está vacía). Para aceptar un caso puntual se agrega el comentario
+`# check-migrations: ignore` en la línea de la llamada.
+
+Uso (desde la raíz del repositorio):
+
+    uv run python -m scripts.check_migrations
+"""
+import argparse
+import ast
+import re
+import sys
+from pathlib import Path
+from typing import List, Optional, Set
+
+VERSIONS_DIR = Path(__file__).resolve().parent.parent / "migrations" / "versions"
+
+IGNORE_MARKER = "check-migrations: ignore"
+CREATE_INDEX_SQL = re.compile(r"\bCREATE\s+(UNIQUE\s+)?INDEX\b(?!\s+CONCURRENTLY)", re.IGNORECASE)
+
+
+def _op_call(node: ast.AST, name: str) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == name
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "op"
+    )
+
+
+def _arg(node: ast.Call, position: Optional[int], keyword: str) -> Optional[ast.AST]:
+    for kw in node.keywords:
+        if kw.arg == keyword:
+            return kw.value
+    if position is not None and len(node.args) > position:
+        return node.args[position]
+    return None
+
+
+def _literal(node: Optional[ast.AST]):
+    try:
+        return ast.literal_eval(node) if node is not None else None
+    except ValueError:
+        return None
+
+
+def _upgrade_body(tree: ast.Module) -> List[ast.AST]:
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "upgrade":
+            return list(ast.walk(node))
+    return []
+
+
+def check_file(path: Path) -> List[str]:
+    source = path.read_text()
+    lines = source.splitlines()
+    nodes = _upgrade_body(ast.parse(source))
+
+    created_tables: Set[str] = {
+        _literal(_arg(node, 0, "table_name"))
+        for node in nodes if _op_call(node, "create_table")
+    }
+    problems = []
+    for node in nodes:
+        if not isinstance(node, ast.Call) or IGNORE_MARKER in lines[node.lineno - 1]:
+            continue
+        if _op_call(node, "create_index"):
+            table = _literal(_arg(node, 1, "table_name"))
+            concurrently = _literal(_arg(node, None, "postgresql_concurrently"))
+            if not concurrently and table not in created_tables:
+                name = _literal(_arg(node, 0, "index_name"))
+                problems.append(f"{path.name}:{node.lineno}: índice bloqueante {name} sobre {table}")
+        elif _op_call(node, "execute"):
+            sql = _literal(_arg(node, 0, "sqltext"))
+            if isinstance(sql, str) and CREATE_INDEX_SQL.search(sql):
+                problems.append(f"{path.name}:{node.lineno}: CREATE INDEX sin CONCURRENTLY en op.execute")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Detecta migraciones que crean índices bloqueantes")
+    parser.add_argument("paths", nargs="*", type=Path, help="Migraciones a revisar (por defecto todas)")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(VERSIONS_DIR.glob("*.py"))
+    problems = []
+    for path in paths:
+        problems.extend(check_file(path))
+
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        print("Use create_index_concurrently de migrations.helpers", file=sys.stderr)
+        return 1
+    print(f"{len(paths)} migraciones revisadas, sin índices bloqueantes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
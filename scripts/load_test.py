@@ -0,0 +1,321 @@
+"""
+Generador de carga para dimensionar el pool de conexiones y los workers.
+
+Ejecuta la aplicación (`app.main:app`) dentro del mismo proceso contra la base
+configurada en DATABASE_URL, siembra empresas, configuraciones y usuarios con
+custom_data realista y luego genera tráfico mixto (create/update/list/get) a una
+tasa objetivo. Al terminar reporta throughput y percentiles de latencia por
+endpoint junto con la ocupación del pool de SQLAlchemy.
+
+Uso (desde la raíz del repositorio):
+
+    uv run python -m scripts.load_test --rps 50 --duration 60
+    DB_POOL_SIZE=10 DB_MAX_OVERFLOW=5 uv run python -m scripts.load_test --rps 200
+
+Cada proceso equivale a un worker de uvicorn: la capacidad total es
+aproximadamente la de un worker multiplicada por el número de workers.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.db import engine
+from app.core.settings import settings
+from app.main import app
+
+TALLAS = ["XS", "S", "M", "L", "XL"]
+AREAS = ["ventas", "operaciones", "tecnologia", "finanzas", "talento_humano"]
+
+USUARIO_CONFIG = {
+    "fields": [
+        {
+            "name": "talla_camisa",
+            "label": "Talla de camisa",
+            "type": "select",
+            "required": True,
+            "options": [{"label": t, "value": t} for t in TALLAS],
+        },
+        {
+            "name": "area",
+            "label": "Área",
+            "type": "select",
+            "options": [{"label": a, "value": a} for a in AREAS],
+        },
+        {
+            "name": "codigo_empleado",
+            "label": "Código de empleado",
+            "type": "string",
+            "required": True,
+            "regex": r"^EMP-\d{6}$",
+        },
+        {
+            "name": "salario",
+            "label": "Salario",
+            "type": "integer",
+            "validations": [{
+                "action": "numeric_comparation",
+                "params": {"operator": "lte", "threshold": 50000000},
+                "error_message": "El salario excede el máximo permitido",
+            }],
+        },
+        {
+            "name": "fecha_ingreso",
+            "label": "Fecha de ingreso",
+            "type": "date",
+            "validations": [{
+                "action": "date_comparation",
+                "params": {"operator": "lte", "reference_date": "today"},
+                "error_message": "La fecha de ingreso no puede ser futura",
+            }],
+        },
+        {"name": "telefono", "label": "Teléfono", "type": "phone"},
+        {"name": "acepta_terminos", "label": "Acepta términos", "type": "boolean"},
+    ]
+}
+
+
+def random_custom_data(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "talla_camisa": rng.choice(TALLAS),
+        "area": rng.choice(AREAS),
+        "codigo_empleado": f"EMP-{rng.randint(0, 999999):06d}",
+        "salario": rng.randint(1_300_000, 20_000_000),
+        "fecha_ingreso": (date.today() - timedelta(days=rng.randint(0, 3650))).isoformat(),
+        "telefono": f"+57 3{rng.randint(100000000, 199999999)}",
+        "acepta_terminos": rng.random() < 0.9,
+    }
+
+
+async def asgi_request(method: str, path: str, body: Any = None, query: str = "") -> Tuple[int, bytes]:
+    """Invoca la aplicación ASGI directamente, sin red ni cliente HTTP externo."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [
+            (b"host", b"loadtest"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("loadtest", 80),
+    }
+    request_sent = False
+    response_done = asyncio.Event()
+    status = 0
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        # El identificador de la corrida no depende de la semilla para poder repetirla sobre la misma base
+        self.run_id = uuid.uuid4().hex[:8]
+        self.empresa_ids: List[str] = []
+        self.usuario_ids: List[str] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.pool_samples: List[Tuple[int, int]] = []
+        self.email_counter = 0
+
+    def next_email(self) -> str:
+        self.email_counter += 1
+        return f"carga-{self.run_id}-{self.email_counter}@example.com"
+
+    def usuario_payload(self, empresa_id: str) -> Dict[str, Any]:
+        return {
+            "email": self.next_email(),
+            "nombre": f"Usuario {self.email_counter}",
+            "password": "clave-de-prueba",
+            "empresa_id": empresa_id,
+            "custom_data": random_custom_data(self.rng),
+        }
+
+    async def seed(self):
+        for i in range(self.args.empresas):
+            status, body = await asgi_request("POST", "/api/v1/empresas/", {
+                "nombre": f"Empresa carga {self.run_id}-{i}",
+                "nit": f"{self.run_id}-{i}",
+                "custom_data": {"sector": self.rng.choice(AREAS)},
+            })
+            if status != 200:
+                raise RuntimeError(f"No se pudo crear la empresa ({status}): {body[:200]!r}")
+            empresa_id = json.loads(body)["id"]
+            self.empresa_ids.append(empresa_id)
+
+            status, body = await asgi_request("POST", "/api/v1/entity-config/", {
+                "empresa_id": empresa_id,
+                "entity_type": "usuario",
+                "config": USUARIO_CONFIG,
+            })
+            if status != 200:
+                raise RuntimeError(f"No se pudo crear la configuración ({status}): {body[:200]!r}")
+
+        semaphore = asyncio.Semaphore(self.args.seed_concurrency)
+
+        async def create_user(empresa_id: str):
+            async with semaphore:
+                status, body = await asgi_request("POST", "/api/v1/usuarios/", self.usuario_payload(empresa_id))
+                if status == 200:
+                    self.usuario_ids.append(json.loads(body)["id"])
+
+        await asyncio.gather(*(
+            create_user(empresa_id)
+            for empresa_id in self.empresa_ids
+            for _ in range(self.args.users_per_empresa)
+        ))
+        if not self.usuario_ids:
+            raise RuntimeError("No se pudo crear ningún usuario durante la siembra")
+        print(f"Sembrado: {len(self.empresa_ids)} empresas, {len(self.usuario_ids)} usuarios (run {self.run_id})")
+
+    async def run_operation(self, name: str):
+        if name == "create":
+            args = ("POST", "/api/v1/usuarios/", self.usuario_payload(self.rng.choice(self.empresa_ids)))
+        elif name == "update":
+            args = ("PUT", f"/api/v1/usuarios/{self.rng.choice(self.usuario_ids)}",
+                    {"custom_data": random_custom_data(self.rng)})
+        elif name == "list":
+            args = ("GET", "/api/v1/usuarios/", None,
+                    f"empresa_id={self.rng.choice(self.empresa_ids)}&limit={self.args.list_limit}")
+        else:
+            args = ("GET", f"/api/v1/usuarios/{self.rng.choice(self.usuario_ids)}")
+
+        start = time.perf_counter()
+        try:
+            status, body = await asgi_request(*args)
+        except Exception:
+            status, body = 0, b""
+        self.latencies[name].append((time.perf_counter() - start) * 1000)
+        if status != 200:
+            self.errors[name] += 1
+        elif name == "create":
+            self.usuario_ids.append(json.loads(body)["id"])
+
+    async def sample_pool(self, stop: asyncio.Event):
+        pool = engine.pool
+        while not stop.is_set():
+            self.pool_samples.append((pool.checkedout(), pool.overflow()))
+            await asyncio.sleep(0.1)
+
+    async def drive(self):
+        mix = parse_mix(self.args.mix)
+        names = list(mix)
+        weights = [mix[n] for n in names]
+        interval = 1 / self.args.rps
+        total = int(self.args.rps * self.args.duration)
+
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(self.sample_pool(stop))
+        tasks = []
+        late = 0
+        start = time.perf_counter()
+        # Carga en lazo abierto: las peticiones se lanzan a la tasa objetivo
+        # aunque las anteriores no hayan terminado
+        for i in range(total):
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -interval:
+                late += 1
+            name = self.rng.choices(names, weights)[0]
+            tasks.append(asyncio.create_task(self.run_operation(name)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await sampler
+
+        self.report(elapsed, late, total)
+
+    def report(self, elapsed: float, late: int, total: int):
+        print(f"\n{total} peticiones en {elapsed:.1f}s -> {total / elapsed:.1f} req/s "
+              f"(objetivo {self.args.rps} req/s, {late} lanzadas con retraso)")
+        print(f"{'endpoint':<10}{'n':>8}{'errores':>9}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name in sorted(self.latencies):
+            values = self.latencies[name]
+            p50, p95, p99 = percentiles(values)
+            print(f"{name:<10}{len(values):>8}{self.errors[name]:>9}{len(values) / elapsed:>9.1f}"
+                  f"{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{max(values):>10.1f}")
+
+        capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        checked_out = [s[0] for s in self.pool_samples] or [0]
+        saturated = sum(1 for c in checked_out if c >= capacity)
+        print(f"\nPool: DB_POOL_SIZE={settings.DB_POOL_SIZE} DB_MAX_OVERFLOW={settings.DB_MAX_OVERFLOW}")
+        print(f"  conexiones en uso: media {statistics.fmean(checked_out):.1f}, máx {max(checked_out)} de {capacity}")
+        print(f"  overflow máximo: {max((s[1] for s in self.pool_samples), default=0)}")
+        print(f"  muestras saturadas: {saturated}/{len(checked_out)} ({100 * saturated / len(checked_out):.0f}%)")
+
+
+def percentiles(values: List[float]) -> Tuple[float, float, float]:
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("create", "update", "list", "get"):
+            raise ValueError(f"Operación desconocida en --mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de usuarios")
+    parser.add_argument("--rps", type=float, default=50, help="Peticiones por segundo objetivo")
+    parser.add_argument("--duration", type=float, default=30, help="Duración en segundos")
+    parser.add_argument("--mix", default="create=1,update=2,list=3,get=4", help="Pesos por operación")
+    parser.add_argument("--empresas", type=int, default=5)
+    parser.add_argument("--users-per-empresa", type=int, default=50)
+    parser.add_argument("--seed-concurrency", type=int, default=10)
+    parser.add_argument("--list-limit", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42, help="Semilla para datos y secuencia reproducibles")
+    load_test = LoadTest(parser.parse_args(args))
+
+    try:
+        await load_test.seed()
+        await load_test.drive()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+import asyncio
+
+from app.core.admission import AdmissionController, REJECTED_QUEUE_FULL, REJECTED_TIMEOUT, is_write_request
+
+
+def _controller(**kwargs) -> AdmissionController:
+    options = dict(max_concurrency=1, max_writes=1, max_queue=10, queue_timeout=1.0)
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def test_timeout_after_slot_granted_counts_as_admitted(monkeypatch):
+    async def scenario():
+        controller = _controller()
+        assert await controller.acquire(False) is None
+
+        async def racing_wait_for(waiter, timeout):
+            # El cupo se libera y se asigna en la misma vuelta en que vence el timeout
+            controller.release(False)
+            assert waiter.done()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(asyncio, "wait_for", racing_wait_for)
+        assert await controller.acquire(False) is None
+        assert controller.snapshot()["active"] == 1
+        controller.release(False)
+        return controller.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["active"] == 0
+    assert snapshot["rejected"]["read"][REJECTED_TIMEOUT] == 0
+
+
+def test_cancel_after_slot_granted_releases_it(monkeypatch):
+    async def scenario():
+        controller = _controller()
+        assert await controller.acquire(True) is None
+
+        async def racing_wait_for(waiter, timeout):
+            controller.release(True)
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(asyncio, "wait_for", racing_wait_for)
+        try:
+            await controller.acquire(True)
+        except asyncio.CancelledError:
+            pass
+        return controller.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["active"] == 0
+    assert snapshot["active_writes"] == 0
+
+
+def test_queue_timeout_rejects_without_leaking():
+    async def scenario():
+        controller = _controller(queue_timeout=0.01)
+        assert await controller.acquire(False) is None
+        assert await controller.acquire(False) == REJECTED_TIMEOUT
+        controller.release(False)
+        return controller.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["active"] == 0
+    assert snapshot["queued"] == {"read": 0, "write": 0}
+    assert snapshot["rejected"]["read"][REJECTED_TIMEOUT] == 1
+
+
+def test_full_queue_rejects_immediately():
+    async def scenario():
+        controller = _controller(max_queue=1)
+        await controller.acquire(False)
+        waiting = asyncio.create_task(controller.acquire(False))
+        await asyncio.sleep(0)
+        rejected = await controller.acquire(False)
+        controller.release(False)
+        await waiting
+        controller.release(False)
+        return rejected
+
+    assert asyncio.run(scenario()) == REJECTED_QUEUE_FULL
+
+
+def test_waiting_reads_are_admitted_before_writes():
+    async def scenario():
+        controller = _controller(max_writes=2)
+        await controller.acquire(True)
+        order = []
+
+        async def request(is_write):
+            await controller.acquire(is_write)
+            order.append("write" if is_write else "read")
+            controller.release(is_write)
+
+        tasks = [asyncio.create_task(request(True)), asyncio.create_task(request(False))]
+        await asyncio.sleep(0)
+        controller.release(True)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["read", "write"]
+
+
+def test_write_cap_leaves_room_for_reads():
+    async def scenario():
+        controller = _controller(max_concurrency=3, max_writes=1, queue_timeout=0.01)
+        assert await controller.acquire(True) is None
+        assert await controller.acquire(True) == REJECTED_TIMEOUT
+        assert await controller.acquire(False) is None
+
+    asyncio.run(scenario())
+
+
+def test_read_only_posts_are_classified_as_reads():
+    assert not is_write_request("GET", "/api/v1/usuarios/")
+    assert not is_write_request("POST", "/api/v1/usuarios/batch-get")
+    assert not is_write_request("POST", "/api/v1/entity-config/e1/usuario/validate")
+    assert not is_write_request("POST", "/api/v1/auth/login")
+    assert is_write_request("POST", "/api/v1/usuarios/")
+    assert is_write_request("PUT", "/api/v1/usuarios/u1")
+    assert is_write_request("POST", "/api/v1/entity-config/")
@@ -0,0 +1,104 @@
+import asyncio
+import contextlib
+
+from app.core.db import shared_session_factory
+from app.core.validation_registry import ValidationContext, ValidationRegistry
+from app.utils.dynamic_validator import run_async_validations
+
+
+@ValidationRegistry.register("test_short_batch", batch=True)
+async def short_batch(values, *, field, context):
+    # Devuelve un resultado menos que los valores recibidos
+    return [True] * (len(values) - 1)
+
+
+@ValidationRegistry.register("test_all_valid_batch", batch=True)
+async def all_valid_batch(values, *, field, context):
+    return [True] * len(values)
+
+
+def _config(action: str) -> dict:
+    return {"fields": [{
+        "name": "codigo",
+        "type": "string",
+        "validations": [{"action": action, "params": {}, "error_message": "inválido"}],
+    }]}
+
+
+def _context() -> ValidationContext:
+    return ValidationContext(empresa_id="e1", entity_type="usuario", session_factory=None)
+
+
+def test_batch_result_length_mismatch_marks_every_value_invalid():
+    records = [{"codigo": "a"}, {"codigo": "b"}, {"codigo": "c"}]
+    errors = asyncio.run(run_async_validations(records, _config("test_short_batch"), _context()))
+    assert sorted(errors) == [0, 1, 2]
+    assert "test_short_batch" in errors[2][0]["msg"]
+
+
+def test_batch_with_matching_length_passes():
+    records = [{"codigo": "a"}, {"codigo": "b"}]
+    assert asyncio.run(run_async_validations(records, _config("test_all_valid_batch"), _context())) == {}
+
+
+class _FakeSession:
+    def __init__(self):
+        self.savepoints = 0
+        self.active = 0
+        self.max_active = 0
+
+    @contextlib.asynccontextmanager
+    async def begin_nested(self):
+        self.savepoints += 1
+        yield
+
+
+def test_shared_session_factory_serializes_uses_in_savepoints():
+    session = _FakeSession()
+    factory = shared_session_factory(session)
+
+    async def use():
+        async with factory() as shared:
+            assert shared is session
+            session.active += 1
+            session.max_active = max(session.max_active, session.active)
+            await asyncio.sleep(0)
+            session.active -= 1
+
+    async def scenario():
+        await asyncio.gather(*(use() for _ in range(5)))
+
+    asyncio.run(scenario())
+    assert session.savepoints == 5
+    assert session.max_active == 1
+
+
+@ValidationRegistry.register("test_stalled_db", timeout=0.2, batch=True)
+async def stalled_db(values, *, field, context):
+    async with context.session_factory():
+        await asyncio.sleep(10)
+    return [True] * len(values)
+
+
+@ValidationRegistry.register("test_quick_db", timeout=0.2)
+async def quick_db(value, *, field, context):
+    async with context.session_factory():
+        await asyncio.sleep(0.05)
+    return True
+
+
+def test_waiting_for_the_shared_session_does_not_count_toward_timeout():
+    config = {"fields": [
+        {"name": "lento", "type": "string", "validations": [{"action": "test_stalled_db", "params": {}, "error_message": "x"}]},
+        {"name": "rapido", "type": "string", "validations": [{"action": "test_quick_db", "params": {}, "error_message": "x"}]},
+    ]}
+    records = [{"lento": "a", "rapido": str(i)} for i in range(3)]
+    context = ValidationContext(empresa_id="e1", entity_type="usuario", session_factory=shared_session_factory(_FakeSession()))
+
+    errors = asyncio.run(run_async_validations(records, config, context))
+
+    # Solo falla el validador que se colgó; los que esperaban la sesión se ejecutan
+    assert sorted(errors) == [0, 1, 2]
+    for record_errors in errors.values():
+        assert [error["loc"][-1] for error in record_errors] == ["lento"]
+        assert "excedió el tiempo límite" in record_errors[0]["msg"]
@@ -0,0 +1,18 @@
+from app.utils.bloom import BloomFilter
+
+
+def test_added_items_are_always_found():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    emails = [f"usuario{i}@empresa.co" for i in range(1000)]
+    for email in emails:
+        bloom.add(email)
+    assert all(email in bloom for email in emails)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"usuario{i}@empresa.co")
+    false_positives = sum(f"otro{i}@empresa.co" in bloom for i in range(10000))
+    assert false_positives < 300
@@ -0,0 +1,82 @@
+import asyncio
+import gzip
+
+import pytest
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
+from app.core.compression import CompressionMiddleware, negotiate
+from app.core.settings import settings
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip, br, zstd", "zstd"),
+    ("gzip;q=1.0, zstd;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "zstd"),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=abc", None),
+])
+def test_negotiate(accept, expected):
+    assert negotiate(accept, ["zstd", "br", "gzip"]) == expected
+
+
+def _call(response: Response, accept: str = "gzip"):
+    middleware = CompressionMiddleware(response)
+    middleware.encoders = {"gzip": middleware.encoders["gzip"]}
+
+    async def scenario():
+        sent = []
+
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(60)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept.encode())]}
+        await middleware(scope, receive, send)
+        headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+        body = b"".join(m.get("body", b"") for m in sent[1:])
+        return headers, body
+
+    return asyncio.run(scenario())
+
+
+def test_large_response_is_compressed():
+    text = "hola " * settings.COMPRESSION_MIN_SIZE
+    headers, body = _call(PlainTextResponse(text))
+    assert headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in headers["vary"].lower()
+    assert gzip.decompress(body).decode() == text
+
+
+def test_small_response_is_left_alone():
+    headers, body = _call(PlainTextResponse("hola"))
+    assert "content-encoding" not in headers
+    assert body == b"hola"
+
+
+def test_event_stream_is_not_compressed():
+    async def events():
+        yield "data: " + "x" * settings.COMPRESSION_MIN_SIZE + "\n\n"
+
+    headers, _ = _call(StreamingResponse(events(), media_type="text/event-stream"))
+    assert "content-encoding" not in headers
+
+
+def test_streamed_chunks_are_compressed():
+    chunks = ["a" * settings.COMPRESSION_MIN_SIZE, "b" * settings.COMPRESSION_MIN_SIZE]
+
+    async def content():
+        for chunk in chunks:
+            yield chunk
+
+    headers, body = _call(StreamingResponse(content(), media_type="text/csv"))
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body).decode() == "".join(chunks)
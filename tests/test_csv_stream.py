@@ -0,0 +1,94 @@
+import asyncio
+import csv
+import io
+
+import pytest
+
+from app.utils.csv_stream import CsvRecordTooLarge, CsvStreamReader
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _read(data: bytes, chunk_size: int = 7, batch_size: int = 100, **kwargs):
+    async def scenario():
+        reader = CsvStreamReader(_chunks(data, chunk_size), **kwargs)
+        header = await reader.read_header()
+        rows = []
+        async for batch in reader.batches(batch_size):
+            rows.extend(batch)
+        return header, rows
+
+    return asyncio.run(scenario())
+
+
+def test_records_split_across_chunks():
+    header, rows = _read(b"email,nombre\na@x.co,Ana\nb@x.co,Beto\n", chunk_size=3)
+    assert header == ["email", "nombre"]
+    assert rows == [(2, ["a@x.co", "Ana"]), (3, ["b@x.co", "Beto"])]
+
+
+def test_quoted_newlines_stay_in_one_record():
+    _, rows = _read(b'email,nota\na@x.co,"linea 1\nlinea 2"\nb@x.co,ok\n')
+    assert rows == [(2, ["a@x.co", "linea 1\nlinea 2"]), (3, ["b@x.co", "ok"])]
+
+
+def test_bom_blank_lines_and_missing_final_newline():
+    _, rows = _read("﻿email\n\na@x.co\nb@x.co".encode("utf-8"))
+    assert [row for row in rows] == [(3, ["a@x.co"]), (4, ["b@x.co"])]
+
+
+def test_stray_quote_in_unquoted_field_does_not_join_lines():
+    _, rows = _read(b'producto,nombre\nMonitor 27",Ana\nTeclado,O"Brien\nMouse,Beto\n')
+    assert rows == [(2, ['Monitor 27"', "Ana"]), (3, ["Teclado", 'O"Brien']), (4, ["Mouse", "Beto"])]
+
+
+def test_escaped_quotes_and_newlines_match_csv_module():
+    text = 'a,b\n"x ""1""\ny",z\n"",""""\n"ab""\ncd"",e",f\nq,"w"\n'
+    _, rows = _read(text.encode())
+    assert [values for _, values in rows] == list(csv.reader(io.StringIO(text)))[1:]
+
+
+def test_invalid_record_is_reported_as_none():
+    _, rows = _read(b'email,nota\na@x.co,"abc"def\n')
+    assert rows == [(2, None)]
+
+
+def test_batches_respect_size():
+    data = b"email\n" + b"".join(f"u{i}@x.co\n".encode() for i in range(5))
+
+    async def scenario():
+        reader = CsvStreamReader(_chunks(data, 4))
+        await reader.read_header()
+        return [len(batch) async for batch in reader.batches(2)]
+
+    assert asyncio.run(scenario()) == [2, 2, 1]
+
+
+def test_unbalanced_quote_is_capped_after_yielding_previous_rows():
+    data = b'email,nota\na@x.co,ok\nb@x.co,"sin cierre\n' + b"relleno\n" * 100
+
+    async def scenario():
+        reader = CsvStreamReader(_chunks(data, 16), max_record_size=200)
+        await reader.read_header()
+        rows = []
+        with pytest.raises(CsvRecordTooLarge) as error:
+            async for batch in reader.batches(100):
+                rows.extend(batch)
+        return rows, error.value
+
+    rows, error = asyncio.run(scenario())
+    assert rows == [(2, ["a@x.co", "ok"])]
+    assert error.row_number == 3
+
+
+def test_line_without_newline_is_capped():
+    async def scenario():
+        reader = CsvStreamReader(_chunks(b"a" * 1000, 64), max_record_size=100)
+        await reader.read_header()
+
+    with pytest.raises(CsvRecordTooLarge) as error:
+        asyncio.run(scenario())
+    assert error.value.row_number == 1
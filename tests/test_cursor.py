@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.utils.cursor import decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    position = (datetime(2026, 10, 19, 12, 30, 15, 123456), uuid.uuid4())
+    cursor = encode_cursor(*position)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == position
+
+
+@pytest.mark.parametrize("cursor", ["", "no-es-base64!", "W10", encode_cursor(datetime(2026, 1, 1), uuid.uuid4())[:-3]])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,87 @@
+import asyncio
+
+from fastapi import APIRouter, FastAPI
+from sqlalchemy.exc import DBAPIError
+
+from app.core.deadlines import DeadlineRoute, db_deadline, statement_timeout_ms
+
+
+class _QueryCanceled(Exception):
+    sqlstate = "57014"
+
+
+seen = {}
+router = APIRouter(route_class=DeadlineRoute)
+
+
+@router.get("/lenta")
+async def slow_query():
+    raise DBAPIError("SELECT 1", {}, _QueryCanceled())
+
+
+@router.get("/timeout")
+@db_deadline(timeout_ms=1234)
+async def configured_timeout():
+    return {"timeout_ms": statement_timeout_ms.get()}
+
+
+@router.post("/colgada")
+async def hanging(body: dict):
+    seen["body"] = body
+    try:
+        await asyncio.sleep(10)
+    except asyncio.CancelledError:
+        seen["cancelled"] = True
+        raise
+
+
+app = FastAPI()
+app.include_router(router, prefix="/x")
+
+
+def _call(method: str, path: str, body: bytes = b"", disconnect_after: float | None = None):
+    async def scenario():
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        sent = []
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            if disconnect_after is None:
+                await asyncio.sleep(100)
+            await asyncio.sleep(disconnect_after)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "method": method, "path": path, "raw_path": path.encode(),
+            "query_string": b"", "headers": [(b"content-type", b"application/json")],
+            "root_path": "", "scheme": "http", "server": ("test", 80), "http_version": "1.1", "app": app,
+        }
+        await app(scope, receive, send)
+        # La cancelación por desconexión no debe quedar pendiente en la tarea
+        assert asyncio.current_task().cancelling() == 0
+        body_parts = [m.get("body", b"") for m in sent if m["type"] == "http.response.body"]
+        return sent[0]["status"], b"".join(body_parts)
+
+    return asyncio.run(scenario())
+
+
+def test_statement_timeout_maps_to_504():
+    status, body = _call("GET", "/x/lenta")
+    assert status == 504
+    assert b"tiempo" in body
+
+
+def test_route_timeout_is_visible_to_get_db():
+    status, body = _call("GET", "/x/timeout")
+    assert status == 200
+    assert body == b'{"timeout_ms":1234}'
+
+
+def test_client_disconnect_cancels_handler():
+    status, _ = _call("POST", "/x/colgada", b'{"a": 1}', disconnect_after=0.05)
+    assert status == 499
+    assert seen == {"body": {"a": 1}, "cancelled": True}
@@ -0,0 +1,81 @@
+import asyncio
+
+from app.core.events import EntityConfigEventBroker
+from app.core.settings import settings
+
+EMPRESA = "empresa-1"
+
+
+def _collect(broker: EntityConfigEventBroker, last_event_id=None, publish=(), count=2):
+    """Primeros `count` mensajes del stream (sin el `retry:` inicial)."""
+    async def scenario():
+        stream = broker.stream(EMPRESA, last_event_id)
+        received = [await anext(stream)]
+        for seq, data in publish:
+            broker.dispatch(seq, EMPRESA, "entity_config", data)
+        while len(received) <= count:
+            received.append(await anext(stream))
+        await stream.aclose()
+        return received[1:]
+
+    return asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+
+def test_replays_events_from_any_worker_after_last_event_id():
+    broker = EntityConfigEventBroker()
+    broker.reset(10)
+    broker.dispatch(11, EMPRESA, "entity_config", {"id": 1})
+    broker.dispatch(12, "otra", "entity_config", {"id": 2})
+    broker.dispatch(13, EMPRESA, "entity_config", {"id": 3})
+
+    events = _collect(broker, "11", count=1)
+    assert events == ['id: 13\nevent: entity_config\ndata: {"id": 3}\n\n']
+
+
+def test_last_event_id_before_listen_started_requires_resync():
+    broker = EntityConfigEventBroker()
+    broker.reset(10)
+    events = _collect(broker, "9", count=1)
+    assert events[0].startswith("event: resync")
+
+
+def test_last_event_id_without_listener_requires_resync():
+    events = _collect(EntityConfigEventBroker(), "3", count=1)
+    assert events[0].startswith("event: resync")
+
+
+def test_evicted_history_requires_resync():
+    broker = EntityConfigEventBroker()
+    broker.reset(0)
+    for seq in range(1, settings.SSE_REPLAY_SIZE + 3):
+        broker.dispatch(seq, EMPRESA, "entity_config", {})
+    assert _collect(broker, "1", count=1)[0].startswith("event: resync")
+    assert _collect(broker, "2", count=1)[0].startswith("id: 3\n")
+
+
+def test_live_events_are_delivered_in_order():
+    broker = EntityConfigEventBroker()
+    broker.reset(0)
+    events = _collect(broker, publish=[(1, {"a": 1}), (2, {"a": 2})], count=2)
+    assert [event.split("\n")[0] for event in events] == ["id: 1", "id: 2"]
+
+
+def test_reset_asks_connected_clients_to_resync():
+    broker = EntityConfigEventBroker()
+    broker.reset(0)
+
+    async def scenario():
+        stream = broker.stream(EMPRESA)
+        await anext(stream)
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        # Conexión de LISTEN perdida: pudo haber eventos sin recibir
+        broker.reset(None)
+        broker.dispatch(5, EMPRESA, "entity_config", {})
+        received = [await pending, await anext(stream)]
+        await stream.aclose()
+        return received
+
+    resync, event = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert resync.startswith("event: resync")
+    assert event.startswith("id: 5\n")
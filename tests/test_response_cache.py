@@ -0,0 +1,71 @@
+import uuid
+
+from app.core.response_cache import EMPRESAS, USUARIOS, ResponseCache
+
+
+def _cache(**kwargs) -> ResponseCache:
+    options = dict(ttl=60, max_bytes=100, max_entry_bytes=60)
+    options.update(kwargs)
+    return ResponseCache(**options)
+
+
+def test_write_to_empresa_invalidates_its_pages_and_global_listing():
+    cache = _cache()
+    empresa, other = uuid.uuid4(), uuid.uuid4()
+    own = cache.key(USUARIOS, empresa, ("list", 0, 100))
+    foreign = cache.key(USUARIOS, other, ("list", 0, 100))
+    everything = cache.key(USUARIOS, None, ("list", 0, 100))
+    for key in (own, foreign, everything):
+        cache.set(key, b"[]")
+
+    cache.bump(USUARIOS, empresa)
+
+    assert cache.key(USUARIOS, empresa, ("list", 0, 100)) != own
+    assert cache.key(USUARIOS, None, ("list", 0, 100)) != everything
+    assert cache.key(USUARIOS, other, ("list", 0, 100)) == foreign
+    assert cache.get(foreign) == b"[]"
+
+
+def test_key_taken_before_write_is_never_served_again():
+    cache = _cache()
+    empresa = uuid.uuid4()
+    stale_key = cache.key(USUARIOS, empresa, ("list",))
+    cache.bump(USUARIOS, empresa)
+    # Resultado de una consulta que empezó antes de la escritura
+    cache.set(stale_key, b"viejo")
+    assert cache.get(cache.key(USUARIOS, empresa, ("list",))) is None
+
+
+def test_namespaces_are_independent():
+    cache = _cache()
+    key = cache.key(EMPRESAS, None, ("list",))
+    cache.bump(USUARIOS, uuid.uuid4())
+    assert cache.key(EMPRESAS, None, ("list",)) == key
+
+
+def test_eviction_is_bounded_by_bytes_in_lru_order():
+    cache = _cache()
+    cache.set("a", b"a" * 40)
+    cache.set("b", b"b" * 40)
+    cache.get("a")
+    cache.set("c", b"c" * 40)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.snapshot()["bytes"] == 80
+
+
+def test_oversized_entries_are_not_stored():
+    cache = _cache()
+    cache.set("grande", b"x" * 61)
+    assert cache.get("grande") is None
+    assert cache.snapshot()["bytes"] == 0
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    cache = _cache(ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr("app.core.response_cache.time.monotonic", lambda: now[0])
+    cache.set("a", b"a")
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.snapshot()["entries"] == 0
@@ -0,0 +1,42 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.settings import settings
+from app.schemas.entity_config import EntityConfig, EntityConfigCreate, EntityConfigUpdate
+from app.utils.safe_regex import find_pattern_problems
+
+NESTED = r"^(\w+\s?)*$"
+
+
+def _config(regex: str) -> dict:
+    return {"fields": [{"name": "codigo", "label": "Código", "type": "string", "regex": regex}]}
+
+
+@pytest.mark.parametrize("pattern", [r"^\d{4}-\d{2}$", r"^[A-Z]{2,3}$", r"^(ab|cd)+$"])
+def test_safe_patterns_have_no_problems(pattern):
+    assert find_pattern_problems(pattern) == []
+
+
+@pytest.mark.parametrize("pattern", [r"(a+)+$", NESTED, r"^(x*)*y$"])
+def test_nested_quantifiers_are_flagged(pattern):
+    assert find_pattern_problems(pattern)
+
+
+def test_invalid_and_too_long_patterns_are_flagged():
+    assert find_pattern_problems("(abc")
+    assert find_pattern_problems(r"(?=a)b")
+    assert find_pattern_problems("a" * (settings.REGEX_MAX_PATTERN_LENGTH + 1))
+
+
+def test_write_schemas_reject_problematic_regex():
+    with pytest.raises(ValidationError):
+        EntityConfigCreate(empresa_id=uuid.uuid4(), entity_type="usuario", config=_config(NESTED))
+    with pytest.raises(ValidationError):
+        EntityConfigUpdate(config=_config(NESTED))
+
+
+def test_stored_config_with_problematic_regex_stays_readable():
+    stored = EntityConfig(id=1, empresa_id=uuid.uuid4(), entity_type="usuario", config=_config(NESTED))
+    assert stored.config.fields[0].regex == NESTED
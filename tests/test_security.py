@@ -0,0 +1,31 @@
+import asyncio
+
+import bcrypt
+
+from app.utils import security
+
+
+def test_hash_passwords_pooled_waits_instead_of_failing(monkeypatch):
+    monkeypatch.setattr(security.settings, "BCRYPT_ROUNDS", 4)
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_MAX_PENDING", 1)
+
+    hashed = asyncio.run(security.hash_passwords_pooled(["a", "b", "c"]))
+
+    assert [bcrypt.checkpw(p.encode(), h.encode()) for p, h in zip("abc", hashed)] == [True, True, True]
+
+
+def test_dummy_hash_is_computed_once(monkeypatch):
+    monkeypatch.setattr(security.settings, "BCRYPT_ROUNDS", 4)
+    monkeypatch.setattr(security, "_dummy_hash", None)
+
+    async def scenario():
+        return await security.dummy_hash(), await security.dummy_hash()
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert not security.needs_rehash(first)
+
+
+def test_verify_password_rejects_malformed_input():
+    assert not security.verify_password("x" * 100, bcrypt.hashpw(b"x", bcrypt.gensalt(4)).decode())
+    assert not security.verify_password("x", "no-es-un-hash")
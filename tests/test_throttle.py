@@ -0,0 +1,37 @@
+from app.core.throttle import AttemptThrottle
+
+
+def _throttle(monkeypatch, now, **kwargs) -> AttemptThrottle:
+    monkeypatch.setattr("app.core.throttle.time.monotonic", lambda: now[0])
+    options = dict(max_failures=3, window_seconds=60, max_keys=10)
+    options.update(kwargs)
+    return AttemptThrottle(**options)
+
+
+def test_blocks_after_max_failures_until_window_passes(monkeypatch):
+    now = [1000.0]
+    throttle = _throttle(monkeypatch, now)
+    for _ in range(3):
+        assert throttle.retry_after("a@x.co") == 0
+        throttle.record_failure("a@x.co")
+    assert throttle.retry_after("a@x.co") == 61
+
+    now[0] += 60
+    assert throttle.retry_after("a@x.co") == 0
+
+
+def test_reset_clears_failures(monkeypatch):
+    throttle = _throttle(monkeypatch, [0.0], max_failures=1)
+    throttle.record_failure("a@x.co")
+    throttle.reset("a@x.co")
+    assert throttle.retry_after("a@x.co") == 0
+
+
+def test_keys_are_capped_in_lru_order(monkeypatch):
+    throttle = _throttle(monkeypatch, [0.0], max_failures=1, max_keys=2)
+    throttle.record_failure("a")
+    throttle.record_failure("b")
+    throttle.record_failure("c")
+    assert throttle.retry_after("a") == 0
+    assert throttle.retry_after("b") > 0
+    assert throttle.retry_after("c") > 0
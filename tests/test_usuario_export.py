@@ -0,0 +1,25 @@
+import pytest
+
+from app.services.usuario_export import _to_int
+
+
+@pytest.mark.parametrize("value, expected", [
+    (12, 12),
+    (2**53 + 1, 2**53 + 1),
+    ("9007199254740993", 9007199254740993),
+    (" 42 ", 42),
+    ("12.0", 12),
+    (3.0, 3),
+    (-7, -7),
+    (2**63, None),
+    (3.5, None),
+    ("3.5", None),
+    ("abc", None),
+    ("nan", None),
+    (float("inf"), None),
+    (True, None),
+    (None, None),
+    ([1], None),
+])
+def test_to_int(value, expected):
+    assert _to_int(value) == expected
@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+
+from app.services import usuario_import
+from app.services.usuario_import import UNUSED_PASSWORD, UsuarioImportService
+from app.utils.csv_stream import CsvStreamReader
+
+
+class _Session:
+    def __init__(self):
+        self.transaction = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def begin(self):
+        self.transaction = True
+
+    async def commit(self):
+        self.transaction = False
+
+
+class _Repository:
+    existing = {"viejo@x.co"}
+    rows = []
+
+    def __init__(self, session):
+        self.session = session
+
+    async def existing_emails(self, emails):
+        self.session.begin()
+        return self.existing & set(emails)
+
+    async def bulk_upsert(self, empresa_id, rows):
+        self.session.begin()
+        _Repository.rows.extend(rows)
+        await self.session.commit()
+        return {email for _, _, email, _, _ in rows}
+
+
+def test_passwords_are_hashed_outside_a_transaction(monkeypatch):
+    session = _Session()
+    hashed_while = []
+
+    async def fake_hash(passwords):
+        hashed_while.append(session.transaction)
+        return [f"hash:{p}" for p in passwords]
+
+    monkeypatch.setattr(usuario_import, "async_session", lambda: session)
+    monkeypatch.setattr(usuario_import, "UsuarioRepository", _Repository)
+    monkeypatch.setattr(usuario_import, "_hash_passwords", fake_hash)
+    monkeypatch.setattr(_Repository, "rows", [])
+
+    async def chunks():
+        yield b"email,nombre,password\nnuevo@x.co,Ana,secreto1\nviejo@x.co,Beto,secreto2\n"
+
+    async def scenario():
+        reader = CsvStreamReader(chunks())
+        header = await reader.read_header()
+        service = UsuarioImportService(uuid.uuid4(), None)
+        return [line async for line in service.run(reader, header)]
+
+    output = asyncio.run(scenario())
+
+    assert output == ["fila,campo,error\r\n"]
+    assert hashed_while == [False]
+    assert [(email, password) for _, _, email, password, _ in _Repository.rows] == [
+        ("nuevo@x.co", "hash:secreto1"),
+        ("viejo@x.co", UNUSED_PASSWORD),
+    ]
@@ -0,0 +1,39 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.db.repositories.usuario import _integrity_http_error
+
+
+class _DriverError(Exception):
+    def __init__(self, constraint_name):
+        super().__init__(constraint_name)
+        self.constraint_name = constraint_name
+
+
+def _integrity_error(sqlstate: str, constraint_name: str) -> IntegrityError:
+    orig = Exception("violación")
+    orig.sqlstate = sqlstate
+    orig.__cause__ = _DriverError(constraint_name)
+    return IntegrityError("INSERT INTO usuarios ...", {}, orig)
+
+
+def test_duplicate_email_is_conflict():
+    error = _integrity_http_error(_integrity_error("23505", "usuarios_email_key"))
+    assert isinstance(error, HTTPException)
+    assert error.status_code == 409
+
+
+def test_missing_empresa_is_not_reported_as_duplicate_email():
+    error = _integrity_http_error(_integrity_error("23503", "usuarios_empresa_id_fkey"))
+    assert isinstance(error, HTTPException)
+    assert error.status_code == 404
+
+
+@pytest.mark.parametrize("sqlstate, constraint", [
+    ("23505", "otra_restriccion_key"),
+    ("23502", None),
+])
+def test_other_violations_propagate(sqlstate, constraint):
+    exc = _integrity_error(sqlstate, constraint)
+    assert _integrity_http_error(exc) is exc